@@ -2,13 +2,15 @@
 import psycopg2
 from psycopg2 import Error
 import configparser
+import functools
 import os
 from src.api.API_Interaction import API_Interaction
 
+@functools.lru_cache(maxsize=1)
 def load_config(config_path='src/db/db_config.ini'):
-    # Config should be in the db directory, used it to organize development
+    # Config should be in the db directory, used it to organize development.
+    # The parsed config is cached, so later calls don't re-read the file.
     config = configparser.ConfigParser()
-    config.read(config_path)
     
     # Check if config file exists; if not, warn and exit.
     if os.path.exists(config_path):
@@ -19,34 +21,38 @@ def load_config(config_path='src/db/db_config.ini'):
     
     return config
 
+# Connection keyword arguments, built from the config once by get_db_kwargs().
+_DB_KWARGS = None
+
+def get_db_kwargs():
+    # Build the psycopg2.connect() keyword arguments once and reuse them for every
+    # connection. A host starting with '/' is a directory, which libpq treats as a
+    # UNIX-socket connection (as on Mac) with no DNS lookup; anything else is a TCP host.
+    global _DB_KWARGS
+    if _DB_KWARGS is None:
+        db_config = load_config()['DATABASE']
+        _DB_KWARGS = {
+            'user': db_config['user'],
+            'password': db_config['password'],
+            'host': db_config.get('host', 'localhost'),
+            'port': db_config['port'],
+            'database': db_config['database']
+        }
+    return _DB_KWARGS
+
 def connect_to_database():
     try:
-        # Getting credentials
-        config = load_config()
-        db_config = config['DATABASE']
-        
-        # For Unix socket connections on Mac, host starts with '/'
-        host = db_config.get('host', 'localhost')
-        
-        # Connect to PostgreSQL
-        connection = psycopg2.connect(
-            user=db_config['user'],
-            password=db_config['password'],
-            host=host,
-            port=db_config['port'],
-            database=db_config['database']
-        )
+        # Connect to PostgreSQL with the cached connection settings
+        connection = psycopg2.connect(**get_db_kwargs())
         
         cursor = connection.cursor()
         
-        # Display PostgreSQL server information
-        print("PostgreSQL server information")
-        print(connection.get_dsn_parameters(), "\n")
-        
-        # Check connection
-        cursor.execute("SELECT version();")
-        record = cursor.fetchone()
-        print("You are connected to - ", record, "\n")
+        # Display PostgreSQL server information only when asked for, using what the
+        # connection already knows rather than an extra SELECT version() round-trip.
+        if os.getenv('DB_VERBOSE'):
+            print("PostgreSQL server information")
+            print(connection.get_dsn_parameters(), "\n")
+            print("You are connected to - PostgreSQL server version", connection.server_version, "\n")
         
         return connection, cursor
         
@@ -57,15 +63,8 @@ def connect_to_database():
 
 
 def main():
-    # Load configuration and build db_config dictionary
-    config = load_config()
-    db_config = {
-        'user': config['DATABASE']['user'],
-        'password': config['DATABASE']['password'],
-        'host': config['DATABASE']['host'],
-        'port': config['DATABASE']['port'],
-        'database': config['DATABASE']['database']
-    }
+    # Load the connection settings once and share them with API_Interaction.
+    db_kwargs = get_db_kwargs()
     
     # List of available APIs in the required order first, followed by the remaining ones.
     available_apis = [
@@ -83,16 +82,16 @@ def main():
         "findGuardianNumber"
     ]
 
-    # Create the API Interaction instance, which automatically prepares API statements.
-    api_handler = API_Interaction(db_config)
+    # Build the menu and the choice-to-API lookup once, instead of on every loop.
+    menu = "\nAvailable APIs:\n" + "\n".join(f"{i}. {api}" for i, api in enumerate(available_apis, 1)) + "\n0. Exit"
+    api_choices = {str(i): api for i, api in enumerate(available_apis, 1)}
 
-    while True:
-        print("\nAvailable APIs:")
-        for i, api in enumerate(available_apis, 1):
-            print(f"{i}. {api}")
+    # Create the API Interaction instance, which automatically registers API statements.
+    api_handler = API_Interaction(db_kwargs)
 
-        print("0. Exit")
-        choice = input("\nEnter the number of the API you want to use (or 0 to exit): ")
+    while True:
+        print(menu)
+        choice = input("\nEnter the number of the API you want to use (or 0 to exit): ").strip()
 
         # Exit condition
         if choice == "0":
@@ -100,18 +99,16 @@ def main():
             break
 
         # Validate choice and execute the selected API
-        try:
-            choice = int(choice)
-            if 1 <= choice <= len(available_apis):
-                selected_api = available_apis[choice - 1]
-                print(f"\nExecuting {selected_api}...\n")
-                api_handler.execute_api(selected_api)
-            else:
-                print("Invalid choice. Please enter a valid number.")
-        except ValueError:
+        selected_api = api_choices.get(choice)
+        if selected_api:
+            print(f"\nExecuting {selected_api}...\n")
+            api_handler.execute_api(selected_api)
+        elif choice.lstrip("-").isdigit():
+            print("Invalid choice. Please enter a valid number.")
+        else:
             print("Invalid input. Please enter a number.")
 
-    # Optionally, clean up persistent connections used by prepared statements.
+    # Optionally, close the pooled connections used by prepared statements.
     if hasattr(api_handler, "cleanup"):
         api_handler.cleanup()
 
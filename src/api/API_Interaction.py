@@ -1,4 +1,8 @@
 # API_Interaction.py (part of driver)
+import configparser
+from concurrent.futures import ThreadPoolExecutor
+from ._pool import get_pool, pooled_connection, close_cached_cursors
+from ._statements import statement_cache, register_statements
 
 # APIs
 from .listStudentsInClass import listStudentsInClass
@@ -15,10 +19,21 @@ from .findGuardianNumber import findGuardianNumber
 from .listAllRooms import listAllRooms
 
 class API_Interaction:
+    # Connection settings read from the DATABASE section of the config file.
+    CONNECTION_KEYS = ("user", "password", "host", "port", "database")
+
     def __init__(self, db_config=None):
-        # Store database configuration (or connection)
+        # Store database configuration; either the parsed config file or a
+        # dictionary of connection settings.
+        if isinstance(db_config, configparser.ConfigParser):
+            db_config = db_config['DATABASE']
         self.db_config = db_config
         
+        # One pool of connections shared by every API, so startup pays for a
+        # couple of connection handshakes instead of one per API.
+        connection_args = {key: db_config[key] for key in self.CONNECTION_KEYS}
+        self.pool = get_pool(connection_args)
+        
         # Mapping API names to their respective classes
         self.api_classes = {
             "listStudentsInClass": listStudentsInClass,
@@ -35,25 +50,56 @@ class API_Interaction:
             "listAllRooms": listAllRooms
         }
         
-        # Initialize prepared statements for each API.
-        self.prepareStatements()
+        # APIs whose statements have been registered and prepared. Nothing is
+        # prepared up front; each API is prepared the first time it is executed.
+        self.prepared_apis = set()
 
-    def prepareStatements(self):
+    def prepareStatements(self, api_names=None):
         """
-        Iterate through each API and call its prepareStatements() method.
-        This method should be called once during initialization to set up
-        all prepared statements for the APIs.
+        Call prepareStatements() on each given API (all APIs by default) to register
+        the SQL texts of its statements, then prepare those statements together on
+        one pooled connection, in a single transaction. APIs that were already
+        prepared are skipped.
+        
+        Any other connection the pool hands out prepares a statement the first time
+        it is executed there, through the shared statement cache.
+        
+        :param api_names: The names of the APIs to prepare; defaults to every API.
         """
-        for name, api_class in self.api_classes.items():
+        if api_names is None:
+            api_names = self.api_classes
+        pending = [name for name in api_names if name not in self.prepared_apis]
+        if not pending:
+            return
+
+        for name in pending:
             try:
-                # Call the prepareStatements() method on the API class,
-                # passing the database connection/configuration.
-                api_class.prepareStatements(self.db_config)
-                print(f"Prepared statements for API: {name}")
+                # Call the prepareStatements() method on the API class (once per
+                # process), passing the shared connection pool.
+                register_statements(self.api_classes[name], self.pool)
             except AttributeError:
                 print(f"API '{name}' does not implement prepareStatements().")
             except Exception as e:
-                print(f"Error preparing statements for API '{name}': {e}")
+                print(f"Error registering statements for API '{name}': {e}")
+
+        try:
+            with pooled_connection(self.pool) as connection:
+                for name in pending:
+                    api_class = self.api_classes[name]
+                    if hasattr(api_class, "statements"):
+                        for sql, param_types in api_class.statements():
+                            statement_cache.get_or_prepare(connection, sql, param_types)
+            self.prepared_apis.update(pending)
+        except Exception as e:
+            print(f"Error preparing statements: {e}")
+
+    def _createInstance(self, api_name):
+        """Creates an instance of the selected API class with the connection pool."""
+        try:
+            return self.api_classes[api_name](self.pool)
+        except TypeError:
+            # Fallback for APIs that don't accept a pool
+            return self.api_classes[api_name]()
 
     def execute_api(self, api_name):
         """Executes the API if it exists"""
@@ -61,12 +107,11 @@ class API_Interaction:
             print(f"Error: API '{api_name}' not found.")
             return
 
-        # Create an instance of the selected API class with database config
-        try:
-            api_instance = self.api_classes[api_name](self.db_config)
-        except TypeError:
-            # Fallback for APIs that don't accept db_config
-            api_instance = self.api_classes[api_name]()
+        # Prepare the API's statements the first time it is used.
+        self.prepareStatements([api_name])
+
+        # Create an instance of the selected API class with the connection pool
+        api_instance = self._createInstance(api_name)
 
         # Execute the API workflow
         print("\n--- API Description ---")
@@ -80,3 +125,44 @@ class API_Interaction:
 
         print("\n--- Displaying Output ---")
         api_instance.displayOutput()
+
+    def execute_api_many(self, requests):
+        """
+        Executes several APIs, overlapping their database work. Every request's input
+        is taken first, one request at a time on the calling thread, so any prompt for
+        missing arguments is answered in order. Each retrieveOutput() then runs on its
+        own worker thread and pooled connection, and outputs are displayed in request
+        order.
+        
+        :param requests: A list of (api_name, args) pairs, where args are passed to getInput().
+        :return: The list of API instances, in request order.
+        """
+        for api_name, _ in requests:
+            if api_name not in self.api_classes:
+                print(f"Error: API '{api_name}' not found.")
+                return []
+
+        # Prepare every requested API up front, before the worker threads start.
+        self.prepareStatements([api_name for api_name, _ in requests])
+
+        # Take every request's input before any worker starts, so prompts never interleave.
+        api_instances = []
+        for api_name, args in requests:
+            api_instance = self._createInstance(api_name)
+            api_instance.getInput(*args)
+            api_instances.append(api_instance)
+
+        # Never run more workers than the pool has connections.
+        workers = max(1, min(len(requests), self.pool.maxconn))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(lambda api_instance: api_instance.retrieveOutput(), api_instances))
+
+        for api_instance in api_instances:
+            print("\n--- Displaying Output ---")
+            api_instance.displayOutput()
+        return api_instances
+
+    def cleanup(self):
+        """Closes the cached cursors and every connection held by the shared pool."""
+        close_cached_cursors()
+        self.pool.closeall()
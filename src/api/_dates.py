@@ -0,0 +1,58 @@
+# _dates.py
+import re
+from datetime import date
+
+# Shape of a YYYY-MM-DD date; date.fromisoformat() then checks that it is a real date.
+DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+START_PROMPT = "Start Date (YYYY-MM-DD): "
+END_PROMPT = "End Date (YYYY-MM-DD): "
+
+def prompt_date(prompt):
+    """
+    Prompts until a valid YYYY-MM-DD date is entered, and returns it as a date.
+    :param prompt: The prompt shown to the user.
+    """
+    while True:
+        date_input = input(prompt).strip()
+        if DATE_RE.match(date_input):
+            try:
+                return date.fromisoformat(date_input)
+            except ValueError:
+                pass
+        print("Invalid date format. Please use YYYY-MM-DD format.")
+
+def prompt_date_range():
+    """
+    Prompts for a start date and an end date until the end date is not before the
+    start date, and returns them as a (start, end) pair of dates.
+    """
+    start_date = prompt_date(START_PROMPT)
+    while True:
+        end_date = prompt_date(END_PROMPT)
+        if end_date >= start_date:
+            return start_date, end_date
+        print("End date must be after or equal to start date.")
+
+def parse_date_range(start_date, end_date):
+    """
+    Returns a (start, end) pair of dates from dates or YYYY-MM-DD strings, as passed
+    to getInput() programmatically.
+    Raises ValueError with a message for the user if either date is invalid or the
+    end date is before the start date.
+    :param start_date: The start date, as a date or a YYYY-MM-DD string.
+    :param end_date: The end date, as a date or a YYYY-MM-DD string.
+    """
+    dates = []
+    for value in (start_date, end_date):
+        if isinstance(value, str):
+            if not DATE_RE.match(value.strip()):
+                raise ValueError(f"Invalid date '{value}'. Please use YYYY-MM-DD format.")
+            try:
+                value = date.fromisoformat(value.strip())
+            except ValueError:
+                raise ValueError(f"Invalid date '{value}'. Please use YYYY-MM-DD format.") from None
+        dates.append(value)
+    if dates[1] < dates[0]:
+        raise ValueError("End date must be after or equal to start date.")
+    return dates[0], dates[1]
@@ -0,0 +1,204 @@
+# _finder_base.py
+from psycopg2.extras import execute_values
+from ._pool import pooled_connection, cached_cursor
+from ._statements import statement_cache, register_statements
+from ._result_cache import result_cache
+
+# Strips the punctuation people type in phone numbers, leaving only the digits.
+_PHONE_PUNCTUATION = str.maketrans("", "", " ()-+.")
+
+def _normalize_phone(phone_number):
+    """
+    Returns the digits of a phone number as typed, dropping a leading "1" country code
+    from 11-digit input, since stored numbers are 10 digits (e.g. "+1 425-401-3422"
+    and "(425) 401-3422" both become "4254013422").
+    :param phone_number: The phone number as entered.
+    """
+    digits = phone_number.strip().translate(_PHONE_PUNCTUATION)
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+    return digits
+
+# Batches larger than this are sent by findMany() as a VALUES list instead of arrays.
+VALUES_BATCH_THRESHOLD = 256
+
+class _FinderBase:
+    """
+    The shared skeleton of the finder APIs, which look people up by name and, for some,
+    by phone number. Subclasses describe their table and result columns in the class
+    attributes below; the statements, findMany(), getInput() and retrieveOutput() are
+    built from them here.
+    """
+    TABLE = None            # Table searched, e.g. "Guardian".
+    COLUMNS = None          # SELECT list, aliased to the keys the results are read by.
+    CURSOR_FACTORY = None   # Cursor class the rows are fetched with.
+    PHONE_LOOKUP = False    # Whether the table can also be searched by phone number.
+    FETCH_ALL = False       # Keep every matching row, rather than only the first.
+    RESULT_ATTR = None      # Instance attribute the result is stored in.
+    LABEL = None            # Name used in prompts and messages, e.g. "Guardian".
+
+    def __init__(self, pool):
+        """
+        Initializes the API instance with the shared connection pool.
+        :param pool: Connection pool shared by all APIs.
+        """
+        self.pool = pool
+        self.first_name = None
+        self.last_name = None
+        self.phone_number = None
+        setattr(self, self.RESULT_ATTR, [] if self.FETCH_ALL else None)
+
+    @classmethod
+    def prepareStatements(cls, pool):
+        """
+        Registers the SQL texts for the finder's lookups:
+          - One for searching by first name and last name, ignoring case.
+          - One for searching by phone number, compared on its digits only (if PHONE_LOOKUP).
+          - One for searching many first name and last name pairs at once (used by findMany).
+        The SQL texts and parameter types are stored as class variables.
+
+        :param pool: Connection pool shared by all APIs.
+        """
+        stmt_name = f"""
+            SELECT {cls.COLUMNS}
+            FROM {cls.TABLE}
+            WHERE lower(LastName) = lower($2) AND lower(FirstName) = lower($1);
+        """
+
+        stmt_names = f"""
+            SELECT {cls.COLUMNS}
+            FROM {cls.TABLE}
+            WHERE (lower(LastName), lower(FirstName)) IN (
+                SELECT lower(n.last_name), lower(n.first_name)
+                FROM unnest($1::text[], $2::text[]) AS n(first_name, last_name)
+            );
+        """
+
+        # Query for large findMany batches, sent through execute_values rather than prepared.
+        cls.query_values = f"""
+            SELECT {cls.COLUMNS}
+            FROM {cls.TABLE}
+            WHERE (lower(LastName), lower(FirstName)) IN (
+                SELECT lower(v.last_name), lower(v.first_name)
+                FROM (VALUES %s) AS v(first_name, last_name)
+            );
+        """
+
+        cls.prepared_statement_name = (stmt_name, ("text", "text"))
+        cls.prepared_statement_names = (stmt_names, ("text[]", "text[]"))
+
+        if cls.PHONE_LOOKUP:
+            stmt_phone = f"""
+                SELECT {cls.COLUMNS}
+                FROM {cls.TABLE}
+                WHERE regexp_replace(PhoneNumber, '[^0-9]', '', 'g') = $1;
+            """
+            cls.prepared_statement_phone = (stmt_phone, ("text",))
+        print(f"Registered statements for {cls.__name__}.")
+
+    @classmethod
+    def statements(cls):
+        """
+        Returns the (SQL text, parameter types) pairs registered by prepareStatements().
+        """
+        statements = [cls.prepared_statement_name, cls.prepared_statement_names]
+        if cls.PHONE_LOOKUP:
+            statements.append(cls.prepared_statement_phone)
+        return statements
+
+    @classmethod
+    def findMany(cls, pool, name_pairs):
+        """
+        Looks up several people by first and last name with a single query, instead of
+        one round-trip per name. Batches of more than VALUES_BATCH_THRESHOLD names are
+        sent as a VALUES list through execute_values.
+
+        :param pool: Connection pool shared by all APIs.
+        :param name_pairs: An iterable of (first name, last name) pairs.
+        :return: A list of rows, one per matching person.
+        """
+        register_statements(cls, pool)
+
+        # Drop repeated names so no one is returned twice across VALUES pages.
+        name_pairs = list(dict.fromkeys((first_name.lower(), last_name.lower()) for first_name, last_name in name_pairs))
+
+        with pooled_connection(pool) as connection:
+            cursor = cached_cursor(connection, cls.CURSOR_FACTORY)
+            if len(name_pairs) > VALUES_BATCH_THRESHOLD:
+                # Large batches join against a VALUES list, which the planner can hash.
+                return execute_values(cursor, cls.query_values, name_pairs, page_size=500, fetch=True)
+
+            first_names = [first_name for first_name, _ in name_pairs]
+            last_names = [last_name for _, last_name in name_pairs]
+            statement_cache.execute(cursor, cls.prepared_statement_names, (first_names, last_names))
+            return cursor.fetchall()
+
+    def getInput(self, first_name=None, last_name=None, phone_number=None):
+        """
+        Takes either (1) First Name & Last Name OR (2) Phone Number as input.
+        If no input is provided, prompts the user. Phone numbers are reduced to their
+        digits, so "(425) 401-3422" and "425-401-3422" find the same person.
+        """
+        if first_name and last_name:
+            self.first_name = first_name
+            self.last_name = last_name
+        elif phone_number:
+            self.phone_number = _normalize_phone(phone_number)
+        else:
+            while True:
+                print(f"\nSearch {self.LABEL} by:")
+                print("1. First Name & Last Name")
+                print("2. Phone Number")
+                choice = input("Enter choice (1 or 2): ").strip()
+
+                if choice == "1":
+                    self.first_name = input(f"Enter {self.LABEL}'s First Name: ").strip()
+                    self.last_name = input(f"Enter {self.LABEL}'s Last Name: ").strip()
+                    break
+                elif choice == "2":
+                    self.phone_number = _normalize_phone(input(f"Enter {self.LABEL}'s Phone Number: "))
+                    break
+                else:
+                    print("Invalid choice. Please try again.")
+
+    def retrieveOutput(self):
+        """
+        Retrieves the matching rows using the prepared statements and stores them in
+        RESULT_ATTR. It borrows a connection from the shared pool, unless the same lookup
+        was already answered and is still in the result cache.
+        """
+        cls = self.__class__
+
+        # Serve repeat lookups from the in-process result cache.
+        if self.first_name and self.last_name:
+            cache_key = (cls.__name__, "name", self.first_name.lower(), self.last_name.lower())
+        else:
+            cache_key = (cls.__name__, "phone", self.phone_number)
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            setattr(self, cls.RESULT_ATTR, cached)
+            return
+
+        try:
+            with pooled_connection(self.pool) as connection:
+                cursor = cached_cursor(connection, cls.CURSOR_FACTORY)
+
+                if self.first_name and self.last_name:
+                    # Execute the prepared statement for name-based search.
+                    statement_cache.execute(cursor, cls.prepared_statement_name,
+                                            (self.first_name, self.last_name))
+                elif cls.PHONE_LOOKUP and self.phone_number:
+                    # Execute the prepared statement for phone-based search.
+                    statement_cache.execute(cursor, cls.prepared_statement_phone,
+                                            (self.phone_number,))
+                else:
+                    print("No valid search parameters provided.")
+                    return
+
+                result = cursor.fetchall() if cls.FETCH_ALL else cursor.fetchone()
+                setattr(self, cls.RESULT_ATTR, result)
+                if result:
+                    result_cache.put(cache_key, result)
+                # Note: The connection is handed back to the pool and its cursor is kept for reuse.
+        except Exception as e:
+            print(f"Error retrieving {cls.LABEL} details: {e}")
@@ -0,0 +1,88 @@
+# _pool.py
+import threading
+import weakref
+from contextlib import contextmanager
+import psycopg2.pool
+
+# The connection pools shared by every API, one per set of connection arguments,
+# created by get_pool().
+POOLS = {}
+_pool_lock = threading.Lock()
+
+# libpq TCP keepalive settings applied to every pooled connection, so the OS notices a
+# connection dropped by the server or a NAT within about 90 seconds of it going idle,
+# instead of the next query blocking on a dead socket. UNIX-socket connections ignore them.
+KEEPALIVE_SETTINGS = {
+    "keepalives": 1,
+    "keepalives_idle": 60,
+    "keepalives_interval": 10,
+    "keepalives_count": 3,
+}
+
+# One reusable cursor per pooled connection, handed out by cached_cursor().
+_cursors = weakref.WeakKeyDictionary()
+_cursors_lock = threading.Lock()
+
+def get_pool(db_config):
+    """
+    Returns the module-level connection pool shared by every API for the given
+    connection arguments, creating it on first use. APIs check a connection out for
+    each call and hand it back afterwards, so concurrent calls run on separate
+    connections instead of queueing on one. A different db_config gets its own pool.
+
+    :param db_config: Keyword arguments for psycopg2.connect(); they take precedence
+                      over KEEPALIVE_SETTINGS.
+    """
+    connect_kwargs = {**KEEPALIVE_SETTINGS, **db_config}
+    key = frozenset(connect_kwargs.items())
+    with _pool_lock:
+        pool = POOLS.get(key)
+        if pool is None or pool.closed:
+            pool = POOLS[key] = psycopg2.pool.ThreadedConnectionPool(2, 10, **connect_kwargs)
+    return pool
+
+
+@contextmanager
+def pooled_connection(pool):
+    """
+    Borrows a connection from the shared pool for the duration of a with block.
+    The connection's own context manager commits the transaction on success and
+    rolls it back on error; either way the connection is handed back to the pool.
+
+    :param pool: Connection pool shared by all APIs.
+    """
+    connection = pool.getconn()
+    try:
+        with connection:
+            yield connection
+    finally:
+        pool.putconn(connection)
+
+
+def cached_cursor(connection, cursor_factory=None):
+    """
+    Returns the cursor kept for a pooled connection, creating it on first use, so
+    APIs reuse one cursor per connection instead of opening and closing one per call.
+    A connection is only ever used by one thread at a time, so its cursor is too.
+
+    :param connection: A connection borrowed from the shared pool.
+    :param cursor_factory: Optional cursor class (e.g. NamedTupleCursor); one cursor
+                           is kept per connection for each factory.
+    """
+    with _cursors_lock:
+        cursors = _cursors.setdefault(connection, {})
+        cursor = cursors.get(cursor_factory)
+        if cursor is None or cursor.closed:
+            cursor = connection.cursor(cursor_factory=cursor_factory)
+            cursors[cursor_factory] = cursor
+    return cursor
+
+
+def close_cached_cursors():
+    """Closes every cursor handed out by cached_cursor()."""
+    with _cursors_lock:
+        for cursors in _cursors.values():
+            for cursor in cursors.values():
+                if not cursor.closed:
+                    cursor.close()
+        _cursors.clear()
@@ -0,0 +1,78 @@
+# _result_cache.py
+import threading
+import time
+from collections import OrderedDict
+
+class ResultCache:
+    """
+    A small in-process LRU cache of lookup results, so repeat lookups with the same
+    arguments are answered without a round-trip to the database. Writers that change
+    the underlying rows call invalidate() to drop stale entries. Results that can also
+    be changed by writers outside this process are given a time-to-live.
+    """
+    def __init__(self, maxsize=1024, ttl=None):
+        """
+        :param maxsize: Maximum number of results kept; the least recently used is dropped first.
+        :param ttl: Optional number of seconds a result stays valid; kept until evicted if None.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns the cached result for a key, or None on a miss.
+
+        :param key: A tuple identifying the API and its lookup arguments.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """
+        Caches a lookup result, evicting the least recently used entry when full.
+
+        :param key: A tuple identifying the API and its lookup arguments.
+        :param value: The result to cache.
+        """
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self.lock:
+            self.entries[key] = (value, expires)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, key=None):
+        """
+        Drops one cached result, every result for an API, or the whole cache.
+
+        :param key: A full cache key, an API name (drops all of that API's results),
+                    or None to clear everything.
+        """
+        with self.lock:
+            if key is None:
+                self.entries.clear()
+            elif isinstance(key, str):
+                for cached_key in [k for k in self.entries if k[0] == key]:
+                    del self.entries[cached_key]
+            else:
+                self.entries.pop(key, None)
+
+
+# One cache shared by the finder APIs; keys start with the API name. Guardian, staff and
+# student rows are only changed by writers outside this process, so the TTL bounds how
+# long a changed or deleted row can still be served.
+result_cache = ResultCache(ttl=300)
+
+# Substitute suggestions, which change with every time off request and availability
+# update. requestTimeOff invalidates it; the TTL bounds staleness from other writers.
+suggestion_cache = ResultCache(maxsize=512, ttl=60)
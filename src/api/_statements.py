@@ -0,0 +1,179 @@
+# _statements.py
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+import psycopg2.errors
+import psycopg2.extensions
+
+class StatementCache:
+    """
+    A per-connection LRU cache of server-side prepared statements, keyed by SQL text.
+    APIs only register their SQL texts up front; a statement is PREPAREd on a
+    connection the first time it is executed there, and the least recently used
+    statement is DEALLOCATEd once a connection holds more than `capacity` of them.
+    Each connection's LRU is tied to its server backend; when a connection is first
+    seen, or its backend has changed, the LRU is rebuilt from pg_prepared_statements.
+    """
+    def __init__(self, capacity=64):
+        """
+        :param capacity: Maximum number of statements kept prepared on one connection.
+        """
+        self.capacity = capacity
+        self.names = {}
+        self.commands = {}
+        self.prepared = weakref.WeakKeyDictionary()
+        self.lock = threading.Lock()
+
+    def statement_name(self, sql, param_types=()):
+        """
+        Returns a stable statement name derived from the SQL text and parameter types,
+        so the same query always maps to the same name on every connection.
+
+        :param sql: The statement body (without PREPARE ... AS).
+        :param param_types: The PostgreSQL types of $1, $2, ...
+        """
+        key = (sql, tuple(param_types))
+        name = self.names.get(key)
+        if name is None:
+            digest = hashlib.blake2s(f"{param_types}:{sql}".encode()).hexdigest()[:16]
+            name = self.names.setdefault(key, f"stmt_{digest}")
+        return name
+
+    def execute_command(self, sql, param_types=()):
+        """
+        Returns the EXECUTE command for a statement, with one %s placeholder per
+        parameter. Statement names are the same on every connection, so each command
+        is built once per process and reused by every later execute().
+
+        :param sql: The statement body (without PREPARE ... AS).
+        :param param_types: The PostgreSQL types of $1, $2, ...
+        """
+        key = (sql, tuple(param_types))
+        command = self.commands.get(key)
+        if command is None:
+            name = self.statement_name(sql, param_types)
+            if param_types:
+                command = f"EXECUTE {name} ({', '.join(['%s'] * len(param_types))});"
+            else:
+                command = f"EXECUTE {name};"
+            command = self.commands.setdefault(key, command)
+        return command
+
+    def get_or_prepare(self, connection, sql, param_types=()):
+        """
+        Returns the name of the prepared statement for the SQL text on the given
+        connection, issuing PREPARE on a miss and evicting the least recently used
+        statement when the connection's cache is full.
+
+        :param connection: The pooled connection the statement will be executed on.
+        :param sql: The statement body (without PREPARE ... AS).
+        :param param_types: The PostgreSQL types of $1, $2, ...
+        :return: The prepared statement name to use with EXECUTE.
+        """
+        name = self.statement_name(sql, param_types)
+        backend_pid = connection.info.backend_pid
+        with self.lock:
+            entry = self.prepared.get(connection)
+        if entry is None or entry[0] != backend_pid:
+            entry = (backend_pid, self._load_prepared(connection))
+            with self.lock:
+                self.prepared[connection] = entry
+        statements = entry[1]
+        if name in statements:
+            statements.move_to_end(name)
+            return name
+
+        cursor = connection.cursor()
+        try:
+            types = f" ({', '.join(param_types)})" if param_types else ""
+            # PREPARE inside a savepoint, so a statement that already exists on the
+            # backend (e.g. prepared by another cache) does not abort the transaction.
+            cursor.execute("SAVEPOINT prepare_statement")
+            try:
+                cursor.execute(f"PREPARE {name}{types} AS {sql}")
+            except psycopg2.errors.DuplicatePreparedStatement:
+                cursor.execute("ROLLBACK TO SAVEPOINT prepare_statement")
+            cursor.execute("RELEASE SAVEPOINT prepare_statement")
+            statements[name] = sql
+            while len(statements) > self.capacity:
+                evicted, _ = statements.popitem(last=False)
+                cursor.execute(f"DEALLOCATE {evicted}")
+        finally:
+            cursor.close()
+        return name
+
+    def execute(self, cursor, statement, params=None, setup=None):
+        """
+        Executes a registered statement on a cursor, PREPAREing it on the cursor's
+        connection first if needed. If the server no longer has the statement (e.g. its
+        session was reset with DISCARD ALL), the connection's cache is dropped so it is
+        rebuilt; when the EXECUTE was the first statement of its transaction, the failed
+        transaction is rolled back and the statement re-prepared and retried once.
+
+        :param cursor: A cursor on the pooled connection to execute on.
+        :param statement: The (SQL text, parameter types) pair of the statement.
+        :param params: The statement's parameters.
+        :param setup: Optional command run just before the EXECUTE, in the same
+                      transaction (e.g. a SET LOCAL); it is run again on a retry.
+        """
+        connection = cursor.connection
+        exec_query = self.execute_command(*statement)
+        first_statement = connection.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        if setup:
+            cursor.execute(setup)
+        self.get_or_prepare(connection, *statement)
+        try:
+            cursor.execute(exec_query, params)
+        except psycopg2.errors.InvalidSqlStatementName:
+            with self.lock:
+                self.prepared.pop(connection, None)
+            if not first_statement:
+                raise
+            connection.rollback()
+            if setup:
+                cursor.execute(setup)
+            self.get_or_prepare(connection, *statement)
+            cursor.execute(exec_query, params)
+
+    def _load_prepared(self, connection):
+        """
+        Returns an LRU of the statements this cache already prepared on the connection's
+        backend, read from pg_prepared_statements, so a statement that survived on the
+        server is reused instead of PREPAREd a second time.
+
+        :param connection: The pooled connection to inspect.
+        """
+        cursor = connection.cursor()
+        try:
+            cursor.execute(
+                "SELECT name, statement FROM pg_prepared_statements WHERE name LIKE %s ORDER BY prepare_time;",
+                ("stmt\\_%",)
+            )
+            return OrderedDict(cursor.fetchall())
+        finally:
+            cursor.close()
+
+
+# One cache shared by every API; it keeps a separate LRU for each pooled connection.
+statement_cache = StatementCache()
+
+# API classes whose prepareStatements() has completed, guarded by _registered_lock.
+_registered_apis = set()
+_registered_lock = threading.Lock()
+
+def register_statements(api_class, pool):
+    """
+    Calls an API class's prepareStatements() once per process. Uses double-checked
+    locking, so concurrent first calls register the class's SQL texts only once and
+    no caller sees a class whose statements are only partly registered.
+
+    :param api_class: The API class to register.
+    :param pool: Connection pool shared by all APIs.
+    """
+    if api_class in _registered_apis:
+        return
+    with _registered_lock:
+        if api_class not in _registered_apis:
+            api_class.prepareStatements(pool)
+            _registered_apis.add(api_class)
@@ -1,14 +1,15 @@
 # addClass.py
-import psycopg2
+from ._pool import pooled_connection, cached_cursor
+from ._statements import statement_cache, register_statements
 
 class addClass:
-    def __init__(self, db_config):
+    def __init__(self, pool):
         """
-        Initializes the API instance with database configuration.
+        Initializes the API instance with the shared connection pool.
         
-        :param db_config: Dictionary containing database connection parameters.
+        :param pool: Connection pool shared by all APIs.
         """
-        self.db_config = db_config
+        self.pool = pool
         self.room_number = None
         self.class_type = None
         self.start_time = None
@@ -17,58 +18,64 @@ class addClass:
         self.new_class_details = None
 
     @classmethod
-    def prepareStatements(cls, db_config):
+    def prepareStatements(cls, pool):
         """
-        Prepares server‑side prepared statements for checking room availability
-        and for inserting a new class.
+        Registers the SQL text for inserting a new class if its room is available.
         
-        Two statements are prepared:
-          1. check_room_availability_plan:
-             Checks if a room has an existing class that overlaps with a given start time and duration.
-          2. insert_class_plan_v5:
+        One statement is registered:
+          prepared_statement_insert:
              Uses a CTE to generate a new ID from the class sequence, then inserts a new class row
-             using that ID, and sets Number to 'C' concatenated with that ID.
-             Returns the new class details: Number, RoomNumber, StartTime, Duration.
+             using that ID, and sets Number to 'C' concatenated with that ID, but only if the room
+             has no existing class that overlaps with the given start time and duration.
+             Returns the new class details: Number, RoomNumber, StartTime, Duration, or no row
+             if the room is not available.
         
-        The persistent connection and prepared statement names are stored as class variables.
+        The class.id sequence is also synchronized with the loaded data here, once,
+        rather than on every insert.
         
-        :param db_config: Dictionary containing database connection parameters.
+        The SQL texts and parameter types are stored as class variables.
+        
+        :param pool: Connection pool shared by all APIs.
         """
+        # Synchronize the sequence for class.id with rows loaded with explicit IDs.
         try:
-            connection = psycopg2.connect(**db_config)
-            cursor = connection.cursor()
-            
-            # Prepare statement to check room availability.
-            stmt_availability = """
-                PREPARE check_room_availability_plan (varchar, time, interval) AS
-                SELECT 1 FROM class
-                WHERE RoomNumber = $1
-                  AND ($2 < (StartTime + Duration) AND StartTime < ($2 + $3));
-            """
-            cursor.execute(stmt_availability)
-            
-            # Prepare statement to insert a new class.
-            stmt_insert = """
-                PREPARE insert_class_plan_v5 (varchar, varchar, time, interval) AS
-                WITH new_id AS (
-                    SELECT nextval(pg_get_serial_sequence('class','id')) as id
-                )
-                INSERT INTO class (ID, Number, ClassTypeID, RoomNumber, StartTime, Duration)
-                SELECT new_id.id, 'C' || new_id.id, $1, $2, $3, $4
-                FROM new_id
-                RETURNING Number, RoomNumber, StartTime, Duration;
-            """
-            cursor.execute(stmt_insert)
-            
-            connection.commit()
-            cursor.close()
-            
-            cls.prepared_conn = connection
-            cls.prepared_statement_availability = "check_room_availability_plan"
-            cls.prepared_statement_insert = "insert_class_plan_v5"
-            print("Prepared statements for addClass.")
+            with pooled_connection(pool) as connection:
+                cursor = connection.cursor()
+                cursor.execute("""
+                    SELECT setval(pg_get_serial_sequence('class','id'),
+                    COALESCE((SELECT max(id) FROM class), 0) + 1, false);
+                """)
+                cursor.close()
         except Exception as e:
-            print("Error preparing statements for addClass:", e)
+            print("Error synchronizing the class id sequence for addClass:", e)
+        
+        # Statement to insert a new class when the room is free at the given time.
+        stmt_insert = """
+            WITH new_id AS (
+                SELECT nextval(pg_get_serial_sequence('class','id')) as id
+            )
+            INSERT INTO class (ID, Number, ClassTypeID, RoomNumber, StartTime, Duration)
+            SELECT new_id.id, 'C' || new_id.id, $1, $2, $3, $4
+            FROM new_id
+            WHERE NOT EXISTS (
+                SELECT 1 FROM class
+                WHERE RoomNumber = $2
+                  AND ($3 < (StartTime + Duration) AND StartTime < ($3 + $4))
+            )
+            RETURNING Number, RoomNumber, StartTime, Duration;
+        """
+        
+        # Store the SQL text and parameter types as a class variable.
+        cls.prepared_statement_insert = (stmt_insert, ("varchar", "varchar", "time", "interval"))
+        
+        print("Registered statements for addClass.")
+
+    @classmethod
+    def statements(cls):
+        """
+        Returns the (SQL text, parameter types) pairs registered by prepareStatements().
+        """
+        return [cls.prepared_statement_insert]
 
     def getDescription(self):
         """
@@ -112,52 +119,31 @@ class addClass:
 
     def retrieveOutput(self):
         """
-        Checks room availability and, if available, creates a new class.
-        If the room is not available, sets an error message.
+        Creates a new class if the room is available, checking availability and
+        inserting in a single statement. If the room is not available, sets an error message.
         """
         try:
-            # Fallback: if prepared_conn is not set, prepare the statements.
-            if not hasattr(self.__class__, 'prepared_conn'):
-                self.__class__.prepareStatements(self.db_config)
-            
-            connection = self.__class__.prepared_conn
-            cursor = connection.cursor()
-            
-            # Synchronize the sequence for class.id (if needed)
-            cursor.execute("""
-                SELECT setval(pg_get_serial_sequence('class','id'),
-                COALESCE((SELECT max(id) FROM class), 0) + 1, false);
-            """)
-            connection.commit()
-            
-            # 1. Check if the room is available.
-            exec_check = f"EXECUTE {self.__class__.prepared_statement_availability} (%s, %s, %s);"
-            cursor.execute(exec_check, (self.room_number, self.start_time, self.duration))
-            availability_result = cursor.fetchone()
-            if availability_result:
-                self.error_message = f"Room {self.room_number} is not available at the given time."
-                cursor.close()
-                return
-            
-            # 2. Room is available. Insert the new class.
-            exec_insert = f"EXECUTE {self.__class__.prepared_statement_insert} (%s, %s, %s, %s);"
-            cursor.execute(exec_insert, (self.class_type, self.room_number, self.start_time, self.duration))
-            result = cursor.fetchone()
-            connection.commit()
-            cursor.close()
+            # Fallback: if the statements were never prepared, prepare them now.
+            register_statements(self.__class__, self.pool)
             
-            if result:
+            with pooled_connection(self.pool) as connection:
+                cursor = cached_cursor(connection)
+                
+                # Insert the new class; no row is inserted if the room is not available.
+                statement_cache.execute(cursor, self.__class__.prepared_statement_insert, (self.class_type, self.room_number, self.start_time, self.duration))
+                if cursor.rowcount == 0:
+                    self.error_message = f"Room {self.room_number} is not available at the given time."
+                    return
+                result = cursor.fetchone()
+                connection.commit()
+                
                 self.new_class_details = {
                     "number": result[0],
                     "room_number": result[1],
                     "start_time": result[2],
                     "duration": result[3]
                 }
-            else:
-                self.error_message = "Failed to create new class."
         except Exception as e:
-            if connection:
-                connection.rollback()
             self.error_message = f"Error creating new class: {e}"
 
     def displayOutput(self):
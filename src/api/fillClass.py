@@ -1,145 +1,103 @@
 # fillClass.py
-import psycopg2
+from ._pool import pooled_connection, cached_cursor
+from ._statements import statement_cache, register_statements
 
 class fillClass:
-    def __init__(self, db_config):
+    def __init__(self, pool):
         """
-        Initializes the API instance with database configuration.
+        Initializes the API instance with the shared connection pool.
         
-        :param db_config: Dictionary containing database connection parameters.
+        :param pool: Connection pool shared by all APIs.
         """
-        self.db_config = db_config
+        self.pool = pool
         self.class_number = None
         self.staff_number = None
         self.assignments = []  # List of dictionaries with keys: number and type
         self.error_message = None
 
     @classmethod
-    def prepareStatements(cls, db_config):
+    def prepareStatements(cls, pool):
         """
-        Prepares server‑side prepared statements for the fillClass API.
+        Registers the SQL texts for the fillClass API.
         
-        Prepared statements:
-          1. get_class_id_plan: Given a class number, returns the class ID.
-          2. get_staff_id_plan: Given a staff number, returns the staff ID.
-          3. insert_staff_plan: Inserts a record into StaffToClass (assigns a staff member to a class)
-             using ON CONFLICT DO NOTHING.
-          4. get_class_assignments_plan: Returns all assigned student and staff numbers (with a type tag)
-             for a given class number.
-          5. get_class_details_plan: Given a class number, returns the class’s StartTime, Duration,
-             and derived Grade (the first character of ClassType.ID) by joining with classtype.
-          6. get_eligible_students_plan: Returns student numbers from the student table for students
-             whose Grade equals a given grade and who do not already have a homeroom assignment
-             (as determined by having a class with a ClassTypeID like '%HR%' other than the target class).
-             (Parameters: target grade, target class number)
-          7. get_student_id_plan: Given a student number, returns the student's internal ID.
-          8. insert_student_plan: Inserts a record into StudentToClass (assigns a student to a class)
-             using ON CONFLICT DO NOTHING.
+        Statements:
+          1. prepared_statement_class_details: Given a class number and a staff number, returns the class ID,
+             the class’s StartTime, Duration, and Grade (ClassType.GradeLevel, the first character of ClassType.ID)
+             by joining with classtype, along with the staff ID, so all three lookups share one round-trip.
+          2. prepared_statement_fill: Inserts a record into StaffToClass (assigns a staff member to a class)
+             and, in the same statement, a StudentToClass record for every student whose Grade
+             equals a given grade and who does not already have a homeroom assignment (as determined by
+             having a homeroom class, flagged by the indexed IsHomeroom column, other than the target class),
+             both using ON CONFLICT DO NOTHING.
+             It then returns all assigned student and staff numbers (with a type tag) for the class:
+             the rows that were already there plus the ones just inserted, taken from RETURNING.
+             (Parameters: staff ID, target class ID, target grade, target class number)
         
-        :param db_config: Dictionary containing database connection parameters.
+        :param pool: Connection pool shared by all APIs.
         """
-        try:
-            connection = psycopg2.connect(**db_config)
-            cursor = connection.cursor()
-            
-            # 1. Prepare statement to get the class ID from class number.
-            stmt_class_id = """
-                PREPARE get_class_id_plan (varchar) AS
-                SELECT ID FROM class WHERE Number = $1;
-            """
-            cursor.execute(stmt_class_id)
-            
-            # 2. Prepare statement to get the staff ID from staff number.
-            stmt_staff_id = """
-                PREPARE get_staff_id_plan (varchar) AS
-                SELECT ID FROM staff WHERE Number = $1;
-            """
-            cursor.execute(stmt_staff_id)
-            
-            # 3. Prepare statement to insert into StaffToClass.
-            stmt_insert_staff = """
-                PREPARE insert_staff_plan (integer, integer) AS
+        # 1. Statement to get the class ID, class details (start time, duration,
+        #    derived grade) and staff ID together.
+        stmt_class_details = """
+            SELECT c.ID, c.StartTime, c.Duration, ct.GradeLevel AS grade,
+                   (SELECT st.ID FROM staff st WHERE st.Number = $2) AS staff_id
+            FROM class c
+            LEFT JOIN classtype ct ON c.ClassTypeID = ct.ID
+            WHERE c.Number = $1;
+        """
+        
+        # 2. Statement to assign the staff member, fill the class with every eligible
+        #    student at once, and return the class's full list of assignments.
+        stmt_fill = """
+            WITH staff_assignment AS (
                 INSERT INTO StaffToClass (StaffID, ClassID)
                 VALUES ($1, $2)
-                ON CONFLICT DO NOTHING;
-            """
-            cursor.execute(stmt_insert_staff)
-            
-            # 4. Prepare statement to get class assignments (both students and staff).
-            stmt_assignments = """
-                PREPARE get_class_assignments_plan (varchar) AS
-                SELECT s.Number, 'student' AS type
-                FROM student s
-                JOIN StudentToClass stc ON s.ID = stc.StudentID
-                JOIN class c ON stc.ClassID = c.ID
-                WHERE c.Number = $1
-                UNION ALL
-                SELECT st.Number, 'staff' AS type
-                FROM staff st
-                JOIN StaffToClass stf ON st.ID = stf.StaffID
-                JOIN class c ON stf.ClassID = c.ID
-                WHERE c.Number = $1;
-            """
-            cursor.execute(stmt_assignments)
-            
-            # 5. Prepare statement to get class details (start time, duration, derived grade).
-            stmt_class_details = """
-                PREPARE get_class_details_plan (varchar) AS
-                SELECT c.StartTime, c.Duration, LEFT(ct.ID, 1) AS grade
-                FROM class c
-                JOIN classtype ct ON c.ClassTypeID = ct.ID
-                WHERE c.Number = $1;
-            """
-            cursor.execute(stmt_class_details)
-            
-            # 6. Prepare statement to get eligible students based on homeroom check.
-            stmt_eligible_students = """
-                PREPARE get_eligible_students_plan (varchar, varchar) AS
-                SELECT s.Number
+                ON CONFLICT DO NOTHING
+                RETURNING StaffID
+            ), student_assignment AS (
+                INSERT INTO StudentToClass (StudentID, ClassID)
+                SELECT s.ID, $2
                 FROM student s
-                WHERE s.Grade = $1
+                WHERE s.Grade = $3
                   AND NOT EXISTS (
                       SELECT 1
                       FROM StudentToClass stc
                       JOIN class c ON stc.ClassID = c.ID
                       WHERE s.ID = stc.StudentID
-                        AND c.ClassTypeID LIKE '%HR%'
-                        AND c.Number <> $2
-                  );
-            """
-            cursor.execute(stmt_eligible_students)
-            
-            # 7. Prepare statement to get student ID from student number.
-            stmt_student_id = """
-                PREPARE get_student_id_plan (varchar) AS
-                SELECT ID FROM student WHERE Number = $1;
-            """
-            cursor.execute(stmt_student_id)
-            
-            # 8. Prepare statement to insert into StudentToClass.
-            stmt_insert_student = """
-                PREPARE insert_student_plan (integer, integer) AS
-                INSERT INTO StudentToClass (StudentID, ClassID)
-                VALUES ($1, $2)
-                ON CONFLICT DO NOTHING;
-            """
-            cursor.execute(stmt_insert_student)
-            
-            connection.commit()
-            cursor.close()
-            
-            cls.prepared_conn = connection
-            cls.prepared_statement_get_class_id = "get_class_id_plan"
-            cls.prepared_statement_get_staff_id = "get_staff_id_plan"
-            cls.prepared_statement_insert_staff = "insert_staff_plan"
-            cls.prepared_statement_assignments = "get_class_assignments_plan"
-            cls.prepared_statement_class_details = "get_class_details_plan"
-            cls.prepared_statement_eligible_students = "get_eligible_students_plan"
-            cls.prepared_statement_get_student_id = "get_student_id_plan"
-            cls.prepared_statement_insert_student = "insert_student_plan"
-            print("Prepared statements for fillClass.")
-        except Exception as e:
-            print("Error preparing statements for fillClass:", e)
+                        AND c.IsHomeroom
+                        AND c.Number <> $4
+                  )
+                ON CONFLICT DO NOTHING
+                RETURNING StudentID
+            ), class_students AS (
+                SELECT StudentID FROM StudentToClass WHERE ClassID = $2
+                UNION
+                SELECT StudentID FROM student_assignment
+            ), class_staff AS (
+                SELECT StaffID FROM StaffToClass WHERE ClassID = $2
+                UNION
+                SELECT StaffID FROM staff_assignment
+            )
+            SELECT s.Number, 'student' AS type
+            FROM class_students cs
+            JOIN student s ON s.ID = cs.StudentID
+            UNION ALL
+            SELECT st.Number, 'staff' AS type
+            FROM class_staff cf
+            JOIN staff st ON st.ID = cf.StaffID;
+        """
+        
+        # Store the SQL texts and parameter types as class variables.
+        cls.prepared_statement_class_details = (stmt_class_details, ("varchar", "varchar"))
+        cls.prepared_statement_fill = (stmt_fill, ("integer", "integer", "varchar", "varchar"))
+        
+        print("Registered statements for fillClass.")
+
+    @classmethod
+    def statements(cls):
+        """
+        Returns the (SQL text, parameter types) pairs registered by prepareStatements().
+        """
+        return [cls.prepared_statement_class_details, cls.prepared_statement_fill]
 
     def getDescription(self):
         """
@@ -178,74 +136,34 @@ class fillClass:
         """
         try:
             # Ensure prepared statements are ready.
-            if not hasattr(self.__class__, 'prepared_conn'):
-                self.__class__.prepareStatements(self.db_config)
-            
-            connection = self.__class__.prepared_conn
-            cursor = connection.cursor()
-            
-            # 1. Get the class ID.
-            exec_class_id = f"EXECUTE {self.__class__.prepared_statement_get_class_id} (%s);"
-            cursor.execute(exec_class_id, (self.class_number,))
-            class_id_result = cursor.fetchone()
-            if not class_id_result:
-                self.error_message = f"Class with number {self.class_number} not found."
-                cursor.close()
-                return
-            class_id = class_id_result[0]
-            
-            # 2. Get the staff ID.
-            exec_staff_id = f"EXECUTE {self.__class__.prepared_statement_get_staff_id} (%s);"
-            cursor.execute(exec_staff_id, (self.staff_number,))
-            staff_id_result = cursor.fetchone()
-            if not staff_id_result:
-                self.error_message = f"Staff with number {self.staff_number} not found."
-                cursor.close()
-                return
-            staff_id = staff_id_result[0]
-            
-            # 3. Insert the staff assignment.
-            exec_insert_staff = f"EXECUTE {self.__class__.prepared_statement_insert_staff} (%s, %s);"
-            cursor.execute(exec_insert_staff, (staff_id, class_id))
-            connection.commit()
-            
-            # 4. Get class details: start time, duration, and derived grade.
-            exec_class_details = f"EXECUTE {self.__class__.prepared_statement_class_details} (%s);"
-            cursor.execute(exec_class_details, (self.class_number,))
-            details = cursor.fetchone()
-            if not details:
-                self.error_message = f"Could not retrieve details for class {self.class_number}."
-                cursor.close()
-                return
-            class_start_time, class_duration, class_grade = details
-            
-            # 5. Retrieve eligible students based on homeroom assignment.
-            exec_eligible_students = f"EXECUTE {self.__class__.prepared_statement_eligible_students} (%s, %s);"
-            cursor.execute(exec_eligible_students, (class_grade, self.class_number))
-            eligible_students = cursor.fetchall()
-            
-            # 6. For each eligible student, get their internal ID and insert into StudentToClass.
-            for (student_number,) in eligible_students:
-                exec_student_id = f"EXECUTE {self.__class__.prepared_statement_get_student_id} (%s);"
-                cursor.execute(exec_student_id, (student_number,))
-                student_id_result = cursor.fetchone()
-                if student_id_result:
-                    student_id = student_id_result[0]
-                    exec_insert_student = f"EXECUTE {self.__class__.prepared_statement_insert_student} (%s, %s);"
-                    cursor.execute(exec_insert_student, (student_id, class_id))
-            connection.commit()
-            
-            # 7. Retrieve all assignments for the class (students and staff).
-            exec_assignments = f"EXECUTE {self.__class__.prepared_statement_assignments} (%s);"
-            cursor.execute(exec_assignments, (self.class_number,))
-            results = cursor.fetchall()
-            self.assignments = []
-            for row in results:
-                self.assignments.append({"number": row[0], "type": row[1]})
-            cursor.close()
+            register_statements(self.__class__, self.pool)
+            
+            with pooled_connection(self.pool) as connection:
+                cursor = cached_cursor(connection)
+                
+                # 1. Get the class ID, class details (start time, duration, derived grade)
+                #    and the staff ID in a single round-trip.
+                statement_cache.execute(cursor, self.__class__.prepared_statement_class_details, (self.class_number, self.staff_number))
+                details = cursor.fetchone()
+                if not details:
+                    self.error_message = f"Class with number {self.class_number} not found."
+                    return
+                class_id, class_start_time, class_duration, class_grade, staff_id = details
+                if class_grade is None:
+                    self.error_message = f"Could not retrieve details for class {self.class_number}."
+                    return
+                if staff_id is None:
+                    self.error_message = f"Staff with number {self.staff_number} not found."
+                    return
+                
+                # 2. Assign the staff member and every eligible student to the class, and
+                #    get back every assignment for the class, in a single round-trip;
+                #    pooled_connection commits once at the end.
+                statement_cache.execute(cursor, self.__class__.prepared_statement_fill, (staff_id, class_id, class_grade, self.class_number))
+                self.assignments = []
+                for row in cursor.fetchall():
+                    self.assignments.append({"number": row[0], "type": row[1]})
         except Exception as e:
-            if connection:
-                connection.rollback()
             self.error_message = f"Error retrieving class assignments: {e}"
 
     def displayOutput(self):
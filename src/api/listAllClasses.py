@@ -1,67 +1,71 @@
 # listAllClasses.py
-import psycopg2
+from psycopg2.extras import NamedTupleCursor
+from ._pool import pooled_connection, cached_cursor
+from ._statements import statement_cache, register_statements
+
+# Grade levels accepted by getInput().
+VALID_GRADES = frozenset({"K", "1", "2", "3", "4", "5"})
 
 class listAllClasses:
-    def __init__(self, db_config):
+    def __init__(self, pool):
         """
-        Initializes the API instance with database configuration.
-        :param db_config: Dictionary containing database connection parameters.
+        Initializes the API instance with the shared connection pool.
+        :param pool: Connection pool shared by all APIs.
         """
-        self.db_config = db_config
+        self.pool = pool
         self.grade = None
         self.classes = []
         
     @classmethod
-    def prepareStatements(cls, db_config):
+    def prepareStatements(cls, pool):
         """
-        Prepares server‑side prepared statements for listing classes.
-        Two statements are prepared:
-          - list_classes_by_grade_plan: For listing classes matching a specific grade level.
-          - list_all_classes_plan: For listing all classes when no grade is specified.
-        The persistent connection and the statement names are stored as class variables.
+        Registers the SQL texts for listing classes.
+        Two statements are registered:
+          - query_grade: For listing classes of a specific grade level, matched on the
+            indexed ClassType.GradeLevel column.
+          - query_all: For listing all classes when no grade is specified.
+        Columns are aliased so each row can be read as a named tuple. Start times and
+        durations are formatted by the server, so displayOutput() prints them as they are
+        instead of building time and timedelta objects only to format them again.
+        The SQL texts and parameter types are stored as class variables.
         
-        :param db_config: Dictionary containing database connection parameters.
+        :param pool: Connection pool shared by all APIs.
         """
-        try:
-            # Establish a persistent connection for prepared statements.
-            connection = psycopg2.connect(**db_config)
-            cursor = connection.cursor()
-            
-            # Prepare statement for listing classes by a specific grade level.
-            stmt_grade = """
-                PREPARE list_classes_by_grade_plan (text) AS
-                SELECT C.Number, CT.Name, C.RoomNumber, C.startTime, C.duration, S.number
-                FROM Class C
-                    JOIN ClassType CT ON CT.ID = C.classTypeID
-                    JOIN StaffToClass SC ON (SC.classID = C.ID)
-                    JOIN Staff S ON (S.ID = SC.staffID)
-                WHERE CT.ID ILIKE $1
-                ORDER BY CT.ID;
-            """
-            cursor.execute(stmt_grade)
-            
-            # Prepare statement for listing all classes (no parameter needed).
-            stmt_all = """
-                PREPARE list_all_classes_plan AS
-                SELECT C.Number, CT.Name, C.RoomNumber, C.startTime, C.duration, S.number
-                FROM Class C
-                    JOIN ClassType CT ON CT.ID = C.classTypeID
-                    JOIN StaffToClass SC ON (SC.classID = C.ID)
-                    JOIN Staff S ON (S.ID = SC.staffID)
-                ORDER BY CT.ID;
-            """
-            cursor.execute(stmt_all)
-            
-            connection.commit()
-            cursor.close()
-            
-            # Store the persistent connection and prepared statement names as class variables.
-            cls.prepared_conn = connection
-            cls.prepared_statement_grade = "list_classes_by_grade_plan"
-            cls.prepared_statement_all = "list_all_classes_plan"
-            print("Prepared statements for listAllClasses.")
-        except Exception as e:
-            print("Error preparing statements for listAllClasses:", e)
+        # Query for listing classes by a specific grade level.
+        stmt_grade = """
+            SELECT C.Number, CT.Name AS type, C.RoomNumber AS room_number,
+                   to_char(C.startTime, 'HH24:MI:SS') AS start_time,
+                   to_char(C.duration, 'FMHH24:MI:SS') AS duration, S.Number AS staff
+            FROM Class C
+                JOIN ClassType CT ON CT.ID = C.classTypeID
+                JOIN StaffToClass SC ON (SC.classID = C.ID)
+                JOIN Staff S ON (S.ID = SC.staffID)
+            WHERE CT.GradeLevel = $1
+            ORDER BY CT.ID;
+        """
+        
+        # Query for listing all classes (no parameter needed).
+        stmt_all = """
+            SELECT C.Number, CT.Name AS type, C.RoomNumber AS room_number,
+                   to_char(C.startTime, 'HH24:MI:SS') AS start_time,
+                   to_char(C.duration, 'FMHH24:MI:SS') AS duration, S.Number AS staff
+            FROM Class C
+                JOIN ClassType CT ON CT.ID = C.classTypeID
+                JOIN StaffToClass SC ON (SC.classID = C.ID)
+                JOIN Staff S ON (S.ID = SC.staffID)
+            ORDER BY CT.ID;
+        """
+        
+        cls.query_grade = (stmt_grade, ("text",))
+        cls.query_all = (stmt_all, ())
+        print("Registered statements for listAllClasses.")
+
+    @classmethod
+    def statements(cls):
+        """
+        Returns the (SQL text, parameter types) pairs registered by prepareStatements().
+        """
+        return [cls.query_grade, cls.query_all]
     
     def getDescription(self):
         """
@@ -91,61 +95,44 @@ Allows anyone to track which classes are offered at our school."""
         specific_grade = input("Do you want classes for a specific grade level? (y/n): ").lower()
         if specific_grade == "y":
             self.grade = input("Enter the grade level (K, 1, 2, 3, 4, 5): ").strip().upper()
-            while(self.grade != "K" and self.grade != "1" and self.grade != "2" and self.grade != "3" and self.grade != "4" and self.grade != "5"):
+            while self.grade not in VALID_GRADES:
                 self.grade = input("Enter an acceptable grade level (K, 1, 2, 3, 4, 5): ").strip().upper()
 
     def retrieveOutput(self):
         """
-        Retrieves classes using the prepared statements.
-        Uses the persistent connection created in prepareStatements().
+        Retrieves the classes into self.classes using the prepared statements.
+        Borrows a connection from the shared pool.
         """
+        # Fallback: if the statements were never registered, register them now.
+        register_statements(self.__class__, self.pool)
         try:
-            # Use the persistent connection from the class variable.
-            connection = self.__class__.prepared_conn
-            cursor = connection.cursor()
-            
-            if self.grade is not None:
-                # Execute the prepared statement for a specific grade.
-                exec_query = f"EXECUTE {self.__class__.prepared_statement_grade} (%s);"
-                cursor.execute(exec_query, (f"%{self.grade}%",))
-            else:
-                # Execute the prepared statement for listing all classes.
-                exec_query = f"EXECUTE {self.__class__.prepared_statement_all};"
-                cursor.execute(exec_query)
-            
-            all_classes = cursor.fetchall()
-            
-            # Format the result into a list of dictionaries.
-            self.classes = []
-            for each_class in all_classes:
-                self.classes.append({
-                    "number": each_class[0],
-                    "type": each_class[1],
-                    "room_number": each_class[2],
-                    "start_time": each_class[3],
-                    "duration": each_class[4],
-                    "staff": each_class[5]
-                })
-            
-            cursor.close()
-            # Note: The persistent connection is not closed here.
+            with pooled_connection(self.pool) as connection:
+                cursor = cached_cursor(connection, NamedTupleCursor)
+                if self.grade is not None:
+                    # Execute the prepared statement for a specific grade.
+                    statement_cache.execute(cursor, self.__class__.query_grade, (self.grade,))
+                else:
+                    # Execute the prepared statement for listing all classes.
+                    statement_cache.execute(cursor, self.__class__.query_all)
+                self.classes = cursor.fetchall()
         except Exception as e:
             print(f"Error finding classes: {e}")
     
     def displayOutput(self):
         """
-        Displays a list of the classes.
+        Displays the list of classes, written with a single print.
         """
         if not self.classes:
             print("No classes were found.")
             return
         
-        print("\n=== All available classes ===")
+        lines = ["\n=== All available classes ==="]
         for i, each_class in enumerate(self.classes, 1):
-            print(f"\n[{i}] Number: {each_class['number']}")
-            print(f"    Class Type: {each_class['type']}")
-            print(f"    Room Number: {each_class['room_number']}")
-            print(f"    Start Time: {each_class['start_time']}")
-            print(f"    Duration: {each_class['duration']}")
-            print(f"    Assigned Staff: {each_class['staff']}")
-        print("\n========================================================")
+            lines.append(f"\n[{i}] Number: {each_class.number}")
+            lines.append(f"    Class Type: {each_class.type}")
+            lines.append(f"    Room Number: {each_class.room_number}")
+            lines.append(f"    Start Time: {each_class.start_time}")
+            lines.append(f"    Duration: {each_class.duration}")
+            lines.append(f"    Assigned Staff: {each_class.staff}")
+        lines.append("\n========================================================")
+        print("\n".join(lines))
@@ -1,44 +1,45 @@
 # listAllRooms.py
-import psycopg2
+from psycopg2.extras import NamedTupleCursor
+from ._pool import pooled_connection, cached_cursor
+from ._statements import statement_cache
 
 class listAllRooms:
-    def __init__(self, db_config):
+    def __init__(self, pool):
         """
-        Initializes the API instance with database configuration.
-        :param db_config: Dictionary containing database connection parameters.
+        Initializes the API instance with the shared connection pool.
+        :param pool: Connection pool shared by all APIs.
         """
-        self.db_config = db_config
+        self.pool = pool
         self.rooms = []  # This will store the list of rooms.
         self.filter_capacity = None  # Optional filter for capacity.
 
     @classmethod
-    def prepareStatements(cls, db_config):
+    def prepareStatements(cls, pool):
         """
-        Prepares a server‑side prepared statement for listing all rooms.
+        Registers the SQL text for listing all rooms.
         The statement retrieves the room number, capacity, and phone number.
-        It uses a parameter to optionally filter by capacity.
+        It uses a parameter to optionally filter by capacity, and its rows are read
+        as named tuples.
         
-        :param db_config: Dictionary containing database connection parameters.
+        :param pool: Connection pool shared by all APIs.
         """
-        try:
-            connection = psycopg2.connect(**db_config)
-            cursor = connection.cursor()
-            stmt = """
-                PREPARE list_all_rooms_plan(integer) AS
-                SELECT Number, Capacity, PhoneNumber
-                FROM Room
-                WHERE ($1 IS NULL OR Capacity >= $1)
-                ORDER BY Number;
-            """
-            cursor.execute(stmt)
-            connection.commit()
-            cursor.close()
-            
-            cls.prepared_conn = connection
-            cls.prepared_statement_name = "list_all_rooms_plan"
-            print("Prepared statement for listAllRooms.")
-        except Exception as e:
-            print("Error preparing statement for listAllRooms:", e)
+        stmt = """
+            SELECT Number, Capacity, PhoneNumber AS phone_number
+            FROM Room
+            WHERE ($1 IS NULL OR Capacity >= $1)
+            ORDER BY Number;
+        """
+        
+        cls.prepared_statement_name = (stmt, ("integer",))
+        
+        print("Registered statement for listAllRooms.")
+
+    @classmethod
+    def statements(cls):
+        """
+        Returns the (SQL text, parameter types) pairs registered by prepareStatements().
+        """
+        return [cls.prepared_statement_name]
 
     def getDescription(self):
         """
@@ -77,37 +78,27 @@ Allows users to view information about all rooms, with an optional filter by cap
         If a capacity filter was set, it passes that parameter to the query.
         """
         try:
-            connection = self.__class__.prepared_conn
-            cursor = connection.cursor()
-            # Use filter_capacity if set, otherwise pass None.
-            param = self.filter_capacity if self.filter_capacity is not None else None
-            exec_query = f"EXECUTE {self.__class__.prepared_statement_name}(%s);"
-            cursor.execute(exec_query, (param,))
-            rooms = cursor.fetchall()
-            
-            self.rooms = []
-            for room in rooms:
-                self.rooms.append({
-                    "number": room[0],
-                    "capacity": room[1],
-                    "phone_number": room[2]
-                })
-            
-            cursor.close()
+            with pooled_connection(self.pool) as connection:
+                cursor = cached_cursor(connection, NamedTupleCursor)
+                # Use filter_capacity if set, otherwise pass None.
+                param = self.filter_capacity if self.filter_capacity is not None else None
+                statement_cache.execute(cursor, self.__class__.prepared_statement_name, (param,))
+                self.rooms = cursor.fetchall()
         except Exception as e:
             print(f"Error retrieving room details: {e}")
 
     def displayOutput(self):
         """
-        Displays the list of all rooms with their details.
+        Displays the list of all rooms with their details, written with a single print.
         """
         if not self.rooms:
             print("No rooms found.")
             return
         
-        print("\n=== List of All Rooms ===")
+        lines = ["\n=== List of All Rooms ==="]
         for i, room in enumerate(self.rooms, 1):
-            print(f"\n[{i}] Room Number: {room['number']}")
-            print(f"    Capacity: {room['capacity']}")
-            print(f"    Phone Number: {room['phone_number'] if room['phone_number'] else 'N/A'}")
-        print("\n=========================")
+            lines.append(f"\n[{i}] Room Number: {room.number}")
+            lines.append(f"    Capacity: {room.capacity}")
+            lines.append(f"    Phone Number: {room.phone_number if room.phone_number else 'N/A'}")
+        lines.append("\n=========================")
+        print("\n".join(lines))
@@ -1,64 +1,58 @@
 # listStudentClasses.py
-import psycopg2
+from psycopg2.extras import NamedTupleCursor
+from ._pool import pooled_connection, cached_cursor
+from ._statements import statement_cache
 
 class listStudentClasses:
-    def __init__(self, db_config):
+    def __init__(self, pool):
         """
-        Initializes the API instance with database configuration.
-        :param db_config: Dictionary containing database connection parameters.
+        Initializes the API instance with the shared connection pool.
+        :param pool: Connection pool shared by all APIs.
         """
-        self.db_config = db_config
+        self.pool = pool
         self.student_number = None
         self.student_first_name = None
         self.student_last_name = None
         self.classes = []
         
     @classmethod
-    def prepareStatements(cls, db_config):
+    def prepareStatements(cls, pool):
         """
-        Prepares server‑side prepared statements for listing a student's classes.
-        Two statements are created:
-          - get_student_details_plan: Retrieves student details by student number.
-          - get_student_classes_plan: Retrieves classes attended by the student (by student ID).
-        The persistent connection and statement names are stored as class variables.
+        Registers the SQL text for listing a student's classes.
+        A single statement is registered:
+          - prepared_statement_classes: Retrieves the student's name together with the
+            classes they attend, by student number. The classes are LEFT JOINed, so a
+            student without classes still returns one row (with NULL class columns),
+            while an unknown student number returns no rows at all. Columns are aliased
+            so each row can be read as a named tuple, and start times and durations
+            come back already formatted for display.
+        The SQL text and parameter types are stored as class variables.
         
-        :param db_config: Dictionary containing database connection parameters.
+        :param pool: Connection pool shared by all APIs.
         """
-        try:
-            # Establish a persistent connection.
-            connection = psycopg2.connect(**db_config)
-            cursor = connection.cursor()
-            
-            # Prepare statement for retrieving student details.
-            stmt_details = """
-                PREPARE get_student_details_plan (text) AS
-                SELECT ID, FirstName, LastName 
-                FROM Student 
-                WHERE Number = $1;
-            """
-            cursor.execute(stmt_details)
-            
-            # Prepare statement for retrieving student classes.
-            stmt_classes = """
-                PREPARE get_student_classes_plan (integer) AS
-                SELECT C.Number, CT.Name, C.RoomNumber, C.startTime, C.duration
-                FROM Class C
-                    JOIN ClassType CT ON CT.ID = C.classTypeID
-                    JOIN StudentToClass SC ON SC.classID = C.ID
-                WHERE SC.studentID = $1;
-            """
-            cursor.execute(stmt_classes)
-            
-            connection.commit()
-            cursor.close()
-            
-            # Store the persistent connection and prepared statement names as class variables.
-            cls.prepared_conn = connection
-            cls.prepared_statement_details = "get_student_details_plan"
-            cls.prepared_statement_classes = "get_student_classes_plan"
-            print("Prepared statements for listStudentClasses.")
-        except Exception as e:
-            print("Error preparing statements for listStudentClasses:", e)
+        # Statement for retrieving the student's name and classes in one round-trip.
+        stmt_classes = """
+            SELECT S.FirstName AS first_name, S.LastName AS last_name,
+                   C.Number, CT.Name AS type, C.RoomNumber AS room_number,
+                   to_char(C.startTime, 'HH24:MI:SS') AS start_time, to_char(C.duration, 'FMHH24:MI:SS') AS duration
+            FROM Student S
+                LEFT JOIN StudentToClass SC ON SC.studentID = S.ID
+                LEFT JOIN Class C ON C.ID = SC.classID
+                LEFT JOIN ClassType CT ON CT.ID = C.classTypeID
+            WHERE S.Number = $1;
+        """
+        
+        # Store the SQL text and parameter types as class variables.
+        cls.prepared_statement_classes = (stmt_classes, ("text",))
+        
+        print("Registered statement for listStudentClasses.")
+
+    @classmethod
+    def statements(cls):
+        """
+        Returns the (SQL text, parameter types) pairs registered by prepareStatements().
+        """
+        return [cls.prepared_statement_classes]
     
     def getDescription(self):
         """
@@ -98,61 +92,43 @@ Allows anyone to track where a student is at any given time throughout the schoo
     
     def retrieveOutput(self):
         """
-        Retrieves the student's classes using the prepared statements.
-        Uses the persistent connection created in prepareStatements().
+        Retrieves the student's name and classes with a single prepared statement.
+        Borrows a connection from the shared pool.
         """
         try:
-            # Use the persistent connection.
-            connection = self.__class__.prepared_conn
-            cursor = connection.cursor()
-            
-            # Retrieve student details using the prepared statement.
-            exec_query_details = f"EXECUTE {self.__class__.prepared_statement_details} (%s);"
-            cursor.execute(exec_query_details, (self.student_number,))
-            student_data = cursor.fetchone()
-            
-            if not student_data:
-                print(f"Error: Student with number {self.student_number} not found.")
-                cursor.close()
-                return
-            
-            student_id = student_data[0]
-            self.student_first_name = student_data[1]
-            self.student_last_name = student_data[2]
-            
-            # Retrieve all classes the student attends using the prepared statement.
-            exec_query_classes = f"EXECUTE {self.__class__.prepared_statement_classes} (%s);"
-            cursor.execute(exec_query_classes, (student_id,))
-            all_classes = cursor.fetchall()
-            
-            # Format the result.
-            self.classes = []
-            for each_class in all_classes:
-                self.classes.append({
-                    "number": each_class[0],
-                    "type": each_class[1],
-                    "room_number": each_class[2],
-                    "start_time": each_class[3],
-                    "duration": each_class[4]
-                })
-            
-            cursor.close()
+            with pooled_connection(self.pool) as connection:
+                cursor = cached_cursor(connection, NamedTupleCursor)
+                
+                # Retrieve the student's name and classes using the prepared statement.
+                statement_cache.execute(cursor, self.__class__.prepared_statement_classes, (self.student_number,))
+                all_classes = cursor.fetchall()
+                
+                if not all_classes:
+                    print(f"Error: Student with number {self.student_number} not found.")
+                    return
+                
+                self.student_first_name = all_classes[0].first_name
+                self.student_last_name = all_classes[0].last_name
+                
+                # Keep the class rows, skipping the NULL row of a student without classes.
+                self.classes = [each_class for each_class in all_classes if each_class.number is not None]
         except Exception as e:
             print(f"Error finding student classes: {e}")
     
     def displayOutput(self):
         """
-        Displays a list of the classes this student attends.
+        Displays a list of the classes this student attends, written with a single print.
         """
         if not self.classes:
             print(f"No classes were found for student {self.student_number}.")
             return
         
-        print(f"\n=== Classes for student {self.student_number}: {self.student_first_name} {self.student_last_name} ===")
+        lines = [f"\n=== Classes for student {self.student_number}: {self.student_first_name} {self.student_last_name} ==="]
         for i, each_class in enumerate(self.classes, 1):
-            print(f"\n[{i}] Number: {each_class['number']}")
-            print(f"    Class Type: {each_class['type']}")
-            print(f"    Room Number: {each_class['room_number']}")
-            print(f"    Start Time: {each_class['start_time']}")
-            print(f"    Duration: {each_class['duration']}")
-        print("\n========================================================")
+            lines.append(f"\n[{i}] Number: {each_class.number}")
+            lines.append(f"    Class Type: {each_class.type}")
+            lines.append(f"    Room Number: {each_class.room_number}")
+            lines.append(f"    Start Time: {each_class.start_time}")
+            lines.append(f"    Duration: {each_class.duration}")
+        lines.append("\n========================================================")
+        print("\n".join(lines))
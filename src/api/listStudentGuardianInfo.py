@@ -1,51 +1,48 @@
 # listStudentGuardianInfo.py
-import psycopg2
+from psycopg2.extras import NamedTupleCursor
+from ._pool import pooled_connection, cached_cursor
+from ._statements import statement_cache, register_statements
 
 class listStudentGuardianInfo:
-    def __init__(self, db_config):
+    def __init__(self, pool):
         """
-        Initializes the API instance with database configuration.
-        :param db_config: Dictionary containing database connection parameters.
+        Initializes the API instance with the shared connection pool.
+        :param pool: Connection pool shared by all APIs.
         """
-        self.db_config = db_config
+        self.pool = pool
         self.student_number = None
         self.guardians = []  # List to hold guardian information
 
     @classmethod
-    def prepareStatements(cls, db_config):
+    def prepareStatements(cls, pool):
         """
-        Prepares a server‑side prepared statement for retrieving guardian information
+        Registers the SQL text for retrieving guardian information
         for a given student number.
         The statement retrieves the guardian's number, first name, last name, phone number,
-        email, and address details (street, city, state, zip) by joining with the address
-        and state tables.
-        The persistent connection and prepared statement name are stored as class variables.
+        email, and address details (street, city, state, zip) from the StudentGuardianInfo
+        materialized view, which already joins the guardian, address and state tables.
+        Columns are aliased so each row can be read as a named tuple.
+        The SQL text and parameter types are stored as a class variable.
         
-        :param db_config: Dictionary containing database connection parameters.
+        :param pool: Connection pool shared by all APIs.
         """
-        try:
-            connection = psycopg2.connect(**db_config)
-            cursor = connection.cursor()
-            stmt = """
-                PREPARE list_student_guardian_info_plan (text) AS
-                SELECT g.Number, g.FirstName, g.LastName, g.PhoneNumber, g.Email,
-                       a.Street, a.City, st.Name as state, a.Zip
-                FROM guardian g
-                JOIN guardiantostudent sg ON g.ID = sg.GuardianID
-                JOIN student s ON sg.StudentID = s.ID
-                JOIN address a ON g.AddressID = a.ID
-                JOIN state st ON a.StateID = st.ID
-                WHERE s.Number = $1;
-            """
-            cursor.execute(stmt)
-            connection.commit()
-            cursor.close()
-            
-            cls.prepared_conn = connection
-            cls.prepared_statement_name = "list_student_guardian_info_plan"
-            print("Prepared statement for listStudentGuardianInfo.")
-        except Exception as e:
-            print("Error preparing statement for listStudentGuardianInfo:", e)
+        stmt = """
+            SELECT Number, FirstName AS first_name, LastName AS last_name,
+                   PhoneNumber AS phone_number, Email, Street, City, State, Zip
+            FROM StudentGuardianInfo
+            WHERE StudentNumber = $1;
+        """
+        
+        cls.prepared_statement_name = (stmt, ("text",))
+        
+        print("Registered statement for listStudentGuardianInfo.")
+
+    @classmethod
+    def statements(cls):
+        """
+        Returns the (SQL text, parameter types) pairs registered by prepareStatements().
+        """
+        return [cls.prepared_statement_name]
 
     def getDescription(self):
         """
@@ -81,51 +78,34 @@ class listStudentGuardianInfo:
     def retrieveOutput(self):
         """
         Retrieves guardian information for the given student number using the prepared statement.
-        It uses the persistent connection created in prepareStatements().
+        It borrows a connection from the shared pool.
         If the connection is not set, it calls prepareStatements() first.
         """
         try:
-            # Fallback: if prepared_conn is not set, prepare the statements.
-            if not hasattr(self.__class__, 'prepared_conn'):
-                self.__class__.prepareStatements(self.db_config)
+            # Fallback: if the statements were never prepared, prepare them now.
+            register_statements(self.__class__, self.pool)
                 
-            connection = self.__class__.prepared_conn
-            cursor = connection.cursor()
-            exec_query = f"EXECUTE {self.__class__.prepared_statement_name} (%s);"
-            cursor.execute(exec_query, (self.student_number,))
-            results = cursor.fetchall()
-            
-            self.guardians = []
-            for row in results:
-                guardian = {
-                    "number": row[0],
-                    "first_name": row[1],
-                    "last_name": row[2],
-                    "phone_number": row[3],
-                    "email": row[4],
-                    "street": row[5],
-                    "city": row[6],
-                    "state": row[7],
-                    "zip": row[8]
-                }
-                self.guardians.append(guardian)
-            cursor.close()
+            with pooled_connection(self.pool) as connection:
+                cursor = cached_cursor(connection, NamedTupleCursor)
+                statement_cache.execute(cursor, self.__class__.prepared_statement_name, (self.student_number,))
+                self.guardians = cursor.fetchall()
         except Exception as e:
             print(f"Error retrieving guardian information: {e}")
 
     def displayOutput(self):
         """
-        Displays the retrieved guardian information.
+        Displays the retrieved guardian information, written with a single print.
         """
         if not self.guardians:
             print(f"No guardians found for student number {self.student_number}.")
             return
         
-        print(f"\n=== Guardian Information for Student {self.student_number} ===")
+        lines = [f"\n=== Guardian Information for Student {self.student_number} ==="]
         for i, guardian in enumerate(self.guardians, 1):
-            print(f"\n[{i}] Guardian Number: {guardian['number']}")
-            print(f"    Name: {guardian['first_name']} {guardian['last_name']}")
-            print(f"    Phone Number: {guardian['phone_number']}")
-            print(f"    Email: {guardian['email']}")
-            print(f"    Address: {guardian['street']}, {guardian['city']}, {guardian['state']} {guardian['zip']}")
-        print("\n========================================================")
+            lines.append(f"\n[{i}] Guardian Number: {guardian.number}")
+            lines.append(f"    Name: {guardian.first_name} {guardian.last_name}")
+            lines.append(f"    Phone Number: {guardian.phone_number}")
+            lines.append(f"    Email: {guardian.email}")
+            lines.append(f"    Address: {guardian.street}, {guardian.city}, {guardian.state} {guardian.zip}")
+        lines.append("\n========================================================")
+        print("\n".join(lines))
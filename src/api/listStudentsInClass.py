@@ -1,49 +1,62 @@
 # listStudentsInClass.py
-import psycopg2
+from psycopg2.extras import NamedTupleCursor
+from ._pool import pooled_connection, cached_cursor
+from ._statements import statement_cache, register_statements
 
 class listStudentsInClass:
-    def __init__(self, db_config):
+    def __init__(self, pool):
         """
-        Initializes the API instance with database configuration.
-        :param db_config: Dictionary containing database connection parameters.
+        Initializes the API instance with the shared connection pool.
+        :param pool: Connection pool shared by all APIs.
         """
-        self.db_config = db_config
+        self.pool = pool
         self.class_number = None
+        self.page_size = None
+        self.after = None
+        self.next_after = None  # Last student number of a full page, to continue from.
         self.students = []
 
     @classmethod
-    def prepareStatements(cls, db_config):
+    def prepareStatements(cls, pool):
         """
-        Prepares the SQL statement for listing students in a class using a server-side
-        prepared statement. This method establishes a persistent connection and prepares
-        the statement once.
+        Registers the SQL texts for listing students in a class.
+          - query_students: Lists every student in the class.
+          - prepared_statement_page: Lists one page of students, ordered by student
+            number and starting after a given number (keyset pagination), so each page
+            costs the same however far into the class it is.
         
-        :param db_config: Dictionary containing database connection parameters.
+        :param pool: Connection pool shared by all APIs.
         """
-        try:
-            # Establish a persistent connection for prepared statements.
-            connection = psycopg2.connect(**db_config)
-            cursor = connection.cursor()
-            
-            # Prepare the statement using PostgreSQL's PREPARE command.
-            stmt = """
-                PREPARE list_students_plan (text) AS
-                SELECT s.Number, s.FirstName, s.LastName 
-                FROM Student s
-                JOIN StudentToClass sc ON s.ID = sc.StudentID
-                JOIN Class c ON sc.ClassID = c.ID
-                WHERE c.Number = $1;
-            """
-            cursor.execute(stmt)
-            connection.commit()
-            cursor.close()
-            
-            # Store the connection and statement name as class variables.
-            cls.prepared_conn = connection
-            cls.prepared_statement_name = "list_students_plan"
-            print("Prepared statement for listStudentsInClass.")
-        except Exception as e:
-            print("Error preparing statement for listStudentsInClass:", e)
+        # Statement for listing the students in a class.
+        stmt_students = """
+            SELECT s.Number AS number, s.FirstName AS first_name, s.LastName AS last_name
+            FROM Student s
+            JOIN StudentToClass sc ON s.ID = sc.StudentID
+            JOIN Class c ON sc.ClassID = c.ID
+            WHERE c.Number = $1;
+        """
+        cls.query_students = (stmt_students, ("text",))
+        
+        # Statement for listing one page of the students in a class.
+        stmt_page = """
+            SELECT s.Number AS number, s.FirstName AS first_name, s.LastName AS last_name
+            FROM Student s
+            JOIN StudentToClass sc ON s.ID = sc.StudentID
+            JOIN Class c ON sc.ClassID = c.ID
+            WHERE c.Number = $1 AND s.Number > $2
+            ORDER BY s.Number
+            LIMIT $3;
+        """
+        cls.prepared_statement_page = (stmt_page, ("text", "text", "integer"))
+        
+        print("Registered statements for listStudentsInClass.")
+
+    @classmethod
+    def statements(cls):
+        """
+        Returns the (SQL text, parameter types) pairs registered by prepareStatements().
+        """
+        return [cls.query_students, cls.prepared_statement_page]
 
     def getDescription(self):
         """
@@ -51,43 +64,78 @@ class listStudentsInClass:
         """
         return "Retrieves a list of students enrolled in a given class."  
 
-    def getInput(self, class_number=None):
+    def getInput(self, class_number=None, page_size=None, after=None):
         """
         Takes the class number as input. If no class number is provided, it prompts the user.
         :param class_number: The unique class number.
+        :param page_size: Optional number of students per page; lists every student if not given.
+        :param after: Student number to continue after, from a previous page's next_after.
         """
         if class_number is None:
             class_number = input("\nEnter Class Number: ").strip()
 
         self.class_number = class_number
+        self.page_size = page_size
+        self.after = after
 
     def retrieveOutput(self):
         """
-        Retrieves students for the given class number using the previously prepared statement.
-        It uses the persistent connection from prepareStatements().
+        Retrieves the students in the given class number into self.students. If a page
+        size was given, only that page is fetched, and next_after is set when more
+        students may follow.
         """
+        # Fallback: if the statements were never registered, register it now.
+        register_statements(self.__class__, self.pool)
+        if self.page_size:
+            self.students = self._fetchPage()
+        else:
+            self.students = self._fetchAll()
+
+    def _fetchPage(self):
+        """
+        Fetches one page of students after self.after, using the prepared page statement.
+        Returns the page's rows.
+        """
+        self.next_after = None
         try:
-            # Use the persistent connection created in prepareStatements.
-            connection = self.__class__.prepared_conn
-            cursor = connection.cursor()
-            
-            # Execute the prepared statement using PostgreSQL's EXECUTE command.
-            exec_query = f"EXECUTE {self.__class__.prepared_statement_name} (%s);"
-            cursor.execute(exec_query, (self.class_number,))
-            self.students = cursor.fetchall()
-            
-            cursor.close()
-            # Note: Do not close the connection here because it is reused for prepared statements.
+            with pooled_connection(self.pool) as connection:
+                cursor = cached_cursor(connection, NamedTupleCursor)
+                statement_cache.execute(cursor, self.__class__.prepared_statement_page,
+                                        (self.class_number, self.after or "", self.page_size))
+                students = cursor.fetchall()
         except Exception as e:
             print(f"Error retrieving students: {e}")
+            return []
+        
+        if len(students) == self.page_size:
+            self.next_after = students[-1].number
+        return students
+
+    def _fetchAll(self):
+        """
+        Fetches every student in the class, using the prepared statement.
+        Returns the students' rows.
+        """
+        try:
+            with pooled_connection(self.pool) as connection:
+                cursor = cached_cursor(connection, NamedTupleCursor)
+                statement_cache.execute(cursor, self.__class__.query_students, (self.class_number,))
+                return cursor.fetchall()
+        except Exception as e:
+            print(f"Error retrieving students: {e}")
+            return []
     
     def displayOutput(self):
         """
-        Displays the retrieved student information.
+        Displays the student information, written with a single print.
         """
         if not self.students:
             print(f"No students found for class {self.class_number}.")
-        else:
-            print(f"Students in class {self.class_number}:")
-            for student in self.students:
-                print(f"Student Number: {student[0]}, Name: {student[1]} {student[2]}")
+            return
+        
+        lines = [f"Students in class {self.class_number}:"]
+        for student in self.students:
+            lines.append(f"Student Number: {student.number}, Name: {student.first_name} {student.last_name}")
+        if self.next_after:
+            lines.append(f"More students may follow; continue after student {self.next_after}.")
+        print("\n".join(lines))
@@ -1,14 +1,17 @@
 # requestTimeOff.py
-import psycopg2
-from datetime import datetime
+from psycopg2.extras import NamedTupleCursor
+from ._pool import pooled_connection, cached_cursor
+from ._statements import statement_cache
+from ._result_cache import suggestion_cache
+from ._dates import prompt_date_range, parse_date_range
 
 class requestTimeOff:
-    def __init__(self, db_config):
+    def __init__(self, pool):
         """
-        Initializes the API instance with database configuration.
-        :param db_config: Dictionary containing database connection parameters.
+        Initializes the API instance with the shared connection pool.
+        :param pool: Connection pool shared by all APIs.
         """
-        self.db_config = db_config
+        self.pool = pool
         self.staff_number = None
         self.start_date = None
         self.end_date = None
@@ -18,89 +21,63 @@ class requestTimeOff:
         self.request_id = None
 
     @classmethod
-    def prepareStatements(cls, db_config):
+    def prepareStatements(cls, pool):
         """
-        Prepares server‑side prepared statements for handling time off requests.
-        The following statements are prepared:
-          - validate_staff_plan: Validates a staff member by their number.
-          - validate_substitute_plan: Validates a substitute by their number.
-          - check_substitute_availability_plan: Checks if a substitute is available for the given dates.
-          - insert_time_off_request_plan: Inserts a time off request and returns the new request ID.
-          - get_time_off_request_plan: Retrieves details of a time off request for confirmation.
+        Registers the SQL texts for handling time off requests.
+        The following statements are registered:
+          - prepared_statement_validate: Validates the staff member and, if given, the
+            substitute by their numbers, and counts the substitute's availability for
+            the given dates, all in one row.
+          - prepared_statement_insert: Inserts a time off request and returns its details
+            for confirmation.
         
-        The persistent connection and prepared statement names are stored as class variables.
+        The SQL texts and parameter types are stored as class variables.
         
-        :param db_config: Dictionary containing database connection parameters.
+        :param pool: Connection pool shared by all APIs.
         """
-        try:
-            connection = psycopg2.connect(**db_config)
-            cursor = connection.cursor()
-            
-            # Prepare statement for validating staff.
-            stmt_staff = """
-                PREPARE validate_staff_plan (text) AS
-                SELECT ID, FirstName, LastName 
-                FROM Staff 
-                WHERE Number = $1;
-            """
-            cursor.execute(stmt_staff)
-            
-            # Prepare statement for validating substitute.
-            stmt_substitute = """
-                PREPARE validate_substitute_plan (text) AS
-                SELECT ID, FirstName, LastName
-                FROM Substitute
-                WHERE Number = $1;
-            """
-            cursor.execute(stmt_substitute)
-            
-            # Prepare statement for checking substitute availability.
-            stmt_availability = """
-                PREPARE check_substitute_availability_plan (integer, date, date) AS
-                SELECT COUNT(*)
-                FROM Availability
-                WHERE SubstituteID = $1
-                AND StartDate <= $2
-                AND EndDate >= $3;
-            """
-            cursor.execute(stmt_availability)
-            
-            # Prepare statement for inserting a time off request.
-            stmt_insert = """
-                PREPARE insert_time_off_request_plan (date, date, text, integer, integer) AS
+        # Statement for validating the staff member and substitute, and checking the
+        # substitute's availability. The substitute columns are NULL (and the count 0)
+        # when no substitute number is given or it is not found.
+        stmt_validate = """
+            SELECT st.ID AS staff_id, st.FirstName AS staff_first_name, st.LastName AS staff_last_name,
+                   sub.ID AS substitute_id,
+                   (SELECT COUNT(*)
+                    FROM Availability a
+                    WHERE a.SubstituteID = sub.ID
+                    AND a.StartDate <= $3
+                    AND a.EndDate >= $4) AS available_count
+            FROM Staff st
+                LEFT JOIN Substitute sub ON sub.Number = $2
+            WHERE st.Number = $1;
+        """
+        
+        # Statement for inserting a time off request and retrieving its details.
+        stmt_insert = """
+            WITH t AS (
                 INSERT INTO TimeOffRequest (StartDate, EndDate, Reason, StaffID, SubstituteID)
                 VALUES ($1, $2, $3, $4, $5)
-                RETURNING ID;
-            """
-            cursor.execute(stmt_insert)
-            
-            # Prepare statement for retrieving time off request details.
-            stmt_request_details = """
-                PREPARE get_time_off_request_plan (integer) AS
-                SELECT t.ID, t.StartDate, t.EndDate, t.Reason, 
-                       s.Number as StaffNumber, s.FirstName as StaffFirstName, s.LastName as StaffLastName,
-                       sub.Number as SubNumber, sub.FirstName as SubFirstName, sub.LastName as SubLastName
-                FROM TimeOffRequest t
-                JOIN Staff s ON t.StaffID = s.ID
-                LEFT JOIN Substitute sub ON t.SubstituteID = sub.ID
-                WHERE t.ID = $1;
-            """
-            cursor.execute(stmt_request_details)
-            
-            connection.commit()
-            cursor.close()
-            
-            # Store the persistent connection and prepared statement names as class variables.
-            cls.prepared_conn = connection
-            cls.prepared_statement_staff = "validate_staff_plan"
-            cls.prepared_statement_substitute = "validate_substitute_plan"
-            cls.prepared_statement_availability = "check_substitute_availability_plan"
-            cls.prepared_statement_insert = "insert_time_off_request_plan"
-            cls.prepared_statement_request_details = "get_time_off_request_plan"
-            
-            print("Prepared statements for requestTimeOff.")
-        except Exception as e:
-            print("Error preparing statements for requestTimeOff:", e)
+                RETURNING ID, StartDate, EndDate, Reason, StaffID, SubstituteID
+            )
+            SELECT t.ID AS request_id, t.StartDate AS start_date, t.EndDate AS end_date, t.Reason AS reason,
+                   s.Number AS staff_number, s.FirstName AS staff_first_name, s.LastName AS staff_last_name,
+                   sub.Number AS sub_number, sub.FirstName AS sub_first_name, sub.LastName AS sub_last_name
+            FROM t
+            JOIN Staff s ON t.StaffID = s.ID
+            LEFT JOIN Substitute sub ON t.SubstituteID = sub.ID;
+        """
+        
+        # Store the SQL texts and parameter types as class variables.
+        cls.prepared_statement_validate = (stmt_validate, ("text", "text", "date", "date"))
+        cls.prepared_statement_insert = (stmt_insert, ("date", "date", "text", "integer", "integer"))
+        
+        print("Registered statements for requestTimeOff.")
+
+    @classmethod
+    def statements(cls):
+        """
+        Returns the (SQL text, parameter types) pairs registered by prepareStatements().
+        """
+        return [cls.prepared_statement_validate, cls.prepared_statement_insert]
 
     def getDescription(self):
         """
@@ -122,6 +99,8 @@ class requestTimeOff:
         """
         Takes the inputs for requesting time off.
         If called without parameters, prompts the user for input interactively.
+        Dates given as parameters are checked here; if they are invalid, or the end
+        date is before the start date, the request is rejected with that message.
         
         :param staff_number: The unique staff number.
         :param start_date: The start date of time off (format: YYYY-MM-DD).
@@ -131,36 +110,18 @@ class requestTimeOff:
         """
         if staff_number and start_date and end_date and reason:
             self.staff_number = staff_number
-            self.start_date = start_date
-            self.end_date = end_date
             self.reason = reason
             self.substitute_number = substitute_number
+            try:
+                self.start_date, self.end_date = parse_date_range(start_date, end_date)
+            except ValueError as e:
+                self.request_result = {"success": False, "message": str(e)}
             return
             
         print("Please enter the following information for the time off request:")
         self.staff_number = input("Staff Number: ").strip()
         
-        while True:
-            try:
-                start_date_input = input("Start Date (YYYY-MM-DD): ").strip()
-                if len(start_date_input.split('-')) != 3:
-                    print("Invalid date format. Please use YYYY-MM-DD format.")
-                    continue
-                self.start_date = start_date_input
-                break
-            except Exception:
-                print("Invalid date format. Please use YYYY-MM-DD format.")
-        
-        while True:
-            try:
-                end_date_input = input("End Date (YYYY-MM-DD): ").strip()
-                if len(end_date_input.split('-')) != 3:
-                    print("Invalid date format. Please use YYYY-MM-DD format.")
-                    continue
-                self.end_date = end_date_input
-                break
-            except Exception:
-                print("Invalid date format. Please use YYYY-MM-DD format.")
+        self.start_date, self.end_date = prompt_date_range()
         
         self.reason = input("Reason for time off: ").strip()
         
@@ -172,89 +133,76 @@ class requestTimeOff:
 
     def retrieveOutput(self):
         """
-        Connects to the database using the persistent connection with prepared statements,
-        validates inputs, and creates a time off request.
+        Borrows a pooled connection with the prepared statements, validates the inputs
+        in one round-trip, and creates the time off request in another. The transaction
+        is committed when the connection is handed back to the pool, after which cached
+        substitute suggestions are invalidated.
         """
+        # getInput() already rejected the request.
+        if self.request_result is not None:
+            return
+        
         try:
-            connection = self.__class__.prepared_conn
-            cursor = connection.cursor()
-            connection.autocommit = False
-            
-            # Validate staff number using the prepared statement.
-            exec_staff = f"EXECUTE {self.__class__.prepared_statement_staff} (%s);"
-            cursor.execute(exec_staff, (self.staff_number,))
-            staff_data = cursor.fetchone()
-            if not staff_data:
-                self.request_result = {"success": False, "message": f"Staff with number {self.staff_number} not found."}
-                cursor.close()
-                return
-            
-            staff_id, staff_first_name, staff_last_name = staff_data
-            
-            # Validate substitute number if provided.
-            substitute_id = None
-            if self.substitute_number:
-                exec_substitute = f"EXECUTE {self.__class__.prepared_statement_substitute} (%s);"
-                cursor.execute(exec_substitute, (self.substitute_number,))
-                substitute_data = cursor.fetchone()
-                if not substitute_data:
-                    self.request_result = {"success": False, "message": f"Substitute with number {self.substitute_number} not found."}
-                    cursor.close()
-                    return
-                substitute_id = substitute_data[0]
+            with pooled_connection(self.pool) as connection:
+                cursor = cached_cursor(connection, NamedTupleCursor)
                 
-                # Check if substitute is available using the prepared statement.
-                exec_availability = f"EXECUTE {self.__class__.prepared_statement_availability} (%s, %s, %s);"
-                cursor.execute(exec_availability, (substitute_id, self.start_date, self.end_date))
-                available_count = cursor.fetchone()[0]
-                if available_count == 0:
-                    self.request_result = {"success": False, "message": f"Substitute is not available for the requested dates."}
-                    cursor.close()
+                # Validate the staff and substitute numbers, and the substitute's availability.
+                # The availability check's selectivity depends heavily on the substitute and
+                # dates, so have this transaction re-plan it on every EXECUTE rather than
+                # fall back to a generic plan; SET LOCAL ends with the transaction, so other
+                # users of the pooled connection keep the default.
+                statement_cache.execute(cursor, self.__class__.prepared_statement_validate,
+                                        (self.staff_number, self.substitute_number, self.start_date, self.end_date),
+                                        setup="SET LOCAL plan_cache_mode = force_custom_plan;")
+                validation = cursor.fetchone()
+                if not validation:
+                    self.request_result = {"success": False, "message": f"Staff with number {self.staff_number} not found."}
                     return
-            
-            # Create time off request using the prepared statement.
-            exec_insert = f"EXECUTE {self.__class__.prepared_statement_insert} (%s, %s, %s, %s, %s);"
-            cursor.execute(exec_insert, (self.start_date, self.end_date, self.reason, staff_id, substitute_id))
-            self.request_id = cursor.fetchone()[0]
-            
-            connection.commit()
-            
-            # Retrieve the created request details for confirmation using the prepared statement.
-            exec_request_details = f"EXECUTE {self.__class__.prepared_statement_request_details} (%s);"
-            cursor.execute(exec_request_details, (self.request_id,))
-            request_details = cursor.fetchone()
-            
-            if request_details:
-                self.request_result = {
-                    "success": True,
-                    "request_id": request_details[0],
-                    "start_date": request_details[1],
-                    "end_date": request_details[2],
-                    "reason": request_details[3],
-                    "staff": {
-                        "number": request_details[4],
-                        "name": f"{request_details[5]} {request_details[6]}"
-                    },
-                    "substitute": None
-                }
-                if request_details[7]:  # If a substitute exists
-                    self.request_result["substitute"] = {
-                        "number": request_details[7],
-                        "name": f"{request_details[8]} {request_details[9]}"
+                
+                staff_id, staff_first_name, staff_last_name, substitute_id, available_count = validation
+                
+                if self.substitute_number:
+                    if substitute_id is None:
+                        self.request_result = {"success": False, "message": f"Substitute with number {self.substitute_number} not found."}
+                        return
+                    if available_count == 0:
+                        self.request_result = {"success": False, "message": f"Substitute is not available for the requested dates."}
+                        return
+                
+                # Create the time off request and retrieve its details for confirmation.
+                statement_cache.execute(cursor, self.__class__.prepared_statement_insert, (self.start_date, self.end_date, self.reason, staff_id, substitute_id))
+                request_details = cursor.fetchone()
+                
+                if request_details:
+                    self.request_id = request_details.request_id
+                    self.request_result = {
+                        "success": True,
+                        "request_id": request_details.request_id,
+                        "start_date": request_details.start_date,
+                        "end_date": request_details.end_date,
+                        "reason": request_details.reason,
+                        "staff": {
+                            "number": request_details.staff_number,
+                            "name": f"{request_details.staff_first_name} {request_details.staff_last_name}"
+                        },
+                        "substitute": None
                     }
-            else:
-                self.request_result = {"success": False, "message": "Failed to retrieve request details."}
-            
-            cursor.close()
+                    if request_details.sub_number:  # If a substitute exists
+                        self.request_result["substitute"] = {
+                            "number": request_details.sub_number,
+                            "name": f"{request_details.sub_first_name} {request_details.sub_last_name}"
+                        }
+                else:
+                    self.request_result = {"success": False, "message": "Failed to retrieve request details."}
+            
+            # The committed request changes which substitutes are free, so drop cached suggestions.
+            if self.request_result["success"]:
+                suggestion_cache.invalidate()
         except Exception as e:
-            if connection:
-                connection.rollback()
             self.request_result = {"success": False, "message": f"Error creating time off request: {e}"}
-            if cursor:
-                cursor.close()
 
     def displayOutput(self):
-        """Displays the result of the time off request operation."""
+        """Displays the result of the time off request operation, written with a single print."""
         if not self.request_result:
             print("No request was processed.")
             return
@@ -263,15 +211,18 @@ class requestTimeOff:
             print(f"Error: {self.request_result['message']}")
             return
             
-        print("\n=== Time Off Request Created Successfully ===")
-        print(f"Request ID: {self.request_result['request_id']}")
-        print(f"Staff: {self.request_result['staff']['name']} (Number: {self.request_result['staff']['number']})")
-        print(f"Dates: {self.request_result['start_date']} to {self.request_result['end_date']}")
-        print(f"Reason: {self.request_result['reason']}")
+        lines = [
+            "\n=== Time Off Request Created Successfully ===",
+            f"Request ID: {self.request_result['request_id']}",
+            f"Staff: {self.request_result['staff']['name']} (Number: {self.request_result['staff']['number']})",
+            f"Dates: {self.request_result['start_date']} to {self.request_result['end_date']}",
+            f"Reason: {self.request_result['reason']}",
+        ]
         
         if self.request_result["substitute"]:
-            print(f"Substitute: {self.request_result['substitute']['name']} (Number: {self.request_result['substitute']['number']})")
+            lines.append(f"Substitute: {self.request_result['substitute']['name']} (Number: {self.request_result['substitute']['number']})")
         else:
-            print("Substitute: None assigned")
+            lines.append("Substitute: None assigned")
         
-        print("===================================================")
+        lines.append("===================================================")
+        print("\n".join(lines))
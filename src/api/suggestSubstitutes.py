@@ -1,112 +1,101 @@
 # suggestSubstitutes.py
-import psycopg2
-from datetime import datetime
+from psycopg2.extras import NamedTupleCursor
+from ._pool import pooled_connection, cached_cursor
+from ._statements import statement_cache
+from ._result_cache import suggestion_cache
+from ._dates import prompt_date_range, parse_date_range
 
 class suggestSubstitutes:
-    def __init__(self, db_config):
+    def __init__(self, pool):
         """
-        Initializes the API instance with database configuration.
-        :param db_config: Dictionary containing database connection parameters.
+        Initializes the API instance with the shared connection pool.
+        :param pool: Connection pool shared by all APIs.
         """
-        self.db_config = db_config
+        self.pool = pool
         self.staff_number = None
         self.start_date = None
         self.end_date = None
+        self.input_error = None  # Why getInput() rejected the given dates, if it did.
         self.substitutes = []
         
     @classmethod
-    def prepareStatements(cls, db_config):
+    def prepareStatements(cls, pool):
         """
-        Prepares server‑side prepared statements for suggesting substitutes.
-        The following statements are prepared:
-          1. suggest_subs_validate_staff_plan:
-             Retrieves staff details based on staff number.
-          2. suggest_subs_timeoff_request_plan:
-             Checks for an existing time off request for the staff within a given date range.
-          3. suggest_subs_assigned_plan:
-             Retrieves details for an assigned substitute (if any) for the request.
-          4. suggest_subs_available_plan:
-             Retrieves available substitutes whose availability covers the entire requested range
-             and who are not already assigned to a conflicting time off request.
+        Registers the SQL text for suggesting substitutes.
+        A single statement is registered:
+          - prepared_statement_suggest: Looks up the staff member, checks for a time off
+            request of theirs that overlaps the given date range, and returns either the
+            substitute already assigned to it, or every substitute whose availability
+            covers the entire range and who is not already assigned to a conflicting
+            time off request. The staff row is LEFT JOINed to the substitutes, so a known
+            staff member without suggestions still returns one row (with NULL substitute
+            columns), while an unknown staff number returns no rows at all.
         
-        The persistent connection and prepared statement names are stored as class variables.
+        Date ranges are compared as inclusive daterange values (overlap with &&, cover
+        with @>), which the GiST indexes on Availability and TimeOffRequest can answer.
+        Columns are aliased so each row can be read as a named tuple.
+        The SQL text and parameter types are stored as class variables.
         
-        :param db_config: Dictionary containing database connection parameters.
+        :param pool: Connection pool shared by all APIs.
         """
-        try:
-            connection = psycopg2.connect(**db_config)
-            cursor = connection.cursor()
-            
-            # Validate staff details.
-            stmt_staff = """
-                PREPARE suggest_subs_validate_staff_plan (text) AS
-                SELECT ID, FirstName, LastName 
-                FROM Staff 
-                WHERE Number = $1;
-            """
-            cursor.execute(stmt_staff)
-            
-            # Check for an existing time off request.
-            stmt_request = """
-                PREPARE suggest_subs_timeoff_request_plan (integer, date, date, date, date, date, date) AS
-                SELECT ID, StartDate, EndDate, SubstituteID
-                FROM TimeOffRequest
-                WHERE StaffID = $1
-                AND (
-                    (StartDate <= $2 AND EndDate >= $3) OR
-                    (StartDate >= $4 AND StartDate <= $5) OR
-                    (EndDate >= $6 AND EndDate <= $7)
-                );
-            """
-            cursor.execute(stmt_request)
-            
-            # Get details for an assigned substitute.
-            stmt_assigned = """
-                PREPARE suggest_subs_assigned_plan (integer, date, date) AS
+        # Statement for suggesting substitutes in one round-trip.
+        stmt_suggest = """
+            WITH staff AS (
+                SELECT ID
+                FROM Staff
+                WHERE Number = $1
+            ), request AS (
+                SELECT tor.SubstituteID
+                FROM TimeOffRequest tor
+                    JOIN staff ON staff.ID = tor.StaffID
+                WHERE daterange(tor.StartDate, tor.EndDate, '[]') && daterange($2, $3, '[]')
+                ORDER BY tor.ID
+                LIMIT 1
+            ), assigned AS (
                 SELECT s.Number, s.FirstName, s.LastName, s.WorkEmail,
-                       a.StartDate, a.EndDate
-                FROM Substitute s
-                JOIN Availability a ON s.ID = a.SubstituteID
-                WHERE s.ID = $1
-                AND (a.StartDate <= $2 AND a.EndDate >= $3);
-            """
-            cursor.execute(stmt_assigned)
-            
-            # Retrieve available substitutes.
-            stmt_available = """
-                PREPARE suggest_subs_available_plan (date, date, date, date, date, date, date, date) AS
+                       a.StartDate, a.EndDate, true AS already_assigned
+                FROM request
+                    JOIN Substitute s ON s.ID = request.SubstituteID
+                    JOIN Availability a ON a.SubstituteID = s.ID
+                WHERE daterange(a.StartDate, a.EndDate, '[]') @> daterange($2, $3, '[]')
+                LIMIT 1
+            ), available AS (
                 SELECT s.Number, s.FirstName, s.LastName, s.WorkEmail,
-                       a.StartDate, a.EndDate
+                       a.StartDate, a.EndDate, false AS already_assigned
                 FROM Substitute s
-                JOIN Availability a ON s.ID = a.SubstituteID
-                WHERE (a.StartDate <= $1 AND a.EndDate >= $2)
-                AND s.ID NOT IN (
-                    SELECT SubstituteID 
-                    FROM TimeOffRequest 
-                    WHERE SubstituteID IS NOT NULL
-                    AND (
-                        (StartDate <= $3 AND EndDate >= $4) OR
-                        (StartDate >= $5 AND StartDate <= $6) OR
-                        (EndDate >= $7 AND EndDate <= $8)
-                    )
+                    JOIN Availability a ON s.ID = a.SubstituteID
+                WHERE daterange(a.StartDate, a.EndDate, '[]') @> daterange($2, $3, '[]')
+                AND NOT EXISTS (SELECT 1 FROM assigned)
+                AND NOT EXISTS (
+                    SELECT 1
+                    FROM TimeOffRequest t
+                    WHERE t.SubstituteID = s.ID
+                    AND daterange(t.StartDate, t.EndDate, '[]') && daterange($2, $3, '[]')
                 )
-                ORDER BY s.LastName, s.FirstName;
-            """
-            cursor.execute(stmt_available)
-            
-            connection.commit()
-            cursor.close()
-            
-            # Store connection and prepared statement names as class variables.
-            cls.prepared_conn = connection
-            cls.prepared_statement_staff = "suggest_subs_validate_staff_plan"
-            cls.prepared_statement_request = "suggest_subs_timeoff_request_plan"
-            cls.prepared_statement_assigned = "suggest_subs_assigned_plan"
-            cls.prepared_statement_available = "suggest_subs_available_plan"
-            
-            print("Prepared statements for suggestSubstitutes.")
-        except Exception as e:
-            print("Error preparing statements for suggestSubstitutes:", e)
+            )
+            SELECT sub.Number AS number, sub.FirstName AS first_name, sub.LastName AS last_name,
+                   sub.WorkEmail AS work_email, sub.StartDate AS availability_start,
+                   sub.EndDate AS availability_end, sub.already_assigned
+            FROM staff
+                LEFT JOIN (
+                    SELECT * FROM assigned
+                    UNION ALL
+                    SELECT * FROM available
+                ) sub ON true
+            ORDER BY sub.already_assigned DESC, sub.LastName, sub.FirstName;
+        """
+        
+        # Store the SQL text and parameter types as class variables.
+        cls.prepared_statement_suggest = (stmt_suggest, ("text", "date", "date"))
+        
+        print("Registered statement for suggestSubstitutes.")
+
+    @classmethod
+    def statements(cls):
+        """
+        Returns the (SQL text, parameter types) pairs registered by prepareStatements().
+        """
+        return [cls.prepared_statement_suggest]
     
     def getDescription(self):
         """
@@ -135,6 +124,8 @@ class suggestSubstitutes:
         """
         Takes the inputs required to suggest substitutes.
         If called without parameters, prompts the user for input interactively.
+        Dates given as parameters are checked here; if they are invalid, or the end
+        date is before the start date, the lookup is rejected with that message.
         
         :param staff_number: The unique staff number.
         :param start_date: The start date to find substitutes for (format: YYYY-MM-DD).
@@ -142,123 +133,73 @@ class suggestSubstitutes:
         """
         if staff_number and start_date and end_date:
             self.staff_number = staff_number
-            self.start_date = start_date
-            self.end_date = end_date
+            try:
+                self.start_date, self.end_date = parse_date_range(start_date, end_date)
+            except ValueError as e:
+                self.input_error = str(e)
             return
             
         print("Please enter the following information to find available substitutes:")
         self.staff_number = input("Staff Number: ").strip()
         
-        while True:
-            try:
-                start_date_input = input("Start Date (YYYY-MM-DD): ").strip()
-                if len(start_date_input.split('-')) != 3:
-                    print("Invalid date format. Please use YYYY-MM-DD format.")
-                    continue
-                self.start_date = start_date_input
-                break
-            except Exception:
-                print("Invalid date format. Please use YYYY-MM-DD format.")
-                
-        while True:
-            try:
-                end_date_input = input("End Date (YYYY-MM-DD): ").strip()
-                if len(end_date_input.split('-')) != 3:
-                    print("Invalid date format. Please use YYYY-MM-DD format.")
-                    continue
-                if datetime.strptime(end_date_input, "%Y-%m-%d") < datetime.strptime(self.start_date, "%Y-%m-%d"):
-                    print("End date must be after or equal to start date.")
-                    continue
-                self.end_date = end_date_input
-                break
-            except Exception:
-                print("Invalid date format. Please use YYYY-MM-DD format.")
+        self.start_date, self.end_date = prompt_date_range()
     
     def retrieveOutput(self):
         """
-        Uses the persistent connection and prepared statements to retrieve available substitutes.
-        First, it validates the staff number. Then it checks if there's an existing time off request.
-        If a substitute is already assigned, it retrieves that substitute's details. Otherwise,
-        it retrieves a list of available substitutes for the given date range.
+        Uses a pooled connection and the prepared statement to retrieve the suggested
+        substitutes in one round-trip. If the staff member's overlapping time off request
+        already has a substitute, only that substitute is returned; otherwise, every
+        available substitute for the given date range is. Repeat lookups are answered from
+        the suggestion cache while it is still valid.
         """
+        if self.input_error:
+            print(f"Error: {self.input_error}")
+            return
+        
+        cache_key = ("suggestSubstitutes", self.staff_number, str(self.start_date), str(self.end_date))
+        cached = suggestion_cache.get(cache_key)
+        if cached is not None:
+            self.substitutes = cached
+            return
+        
         try:
-            connection = self.__class__.prepared_conn
-            cursor = connection.cursor()
-            
-            # Validate staff using the prepared statement.
-            exec_staff = f"EXECUTE {self.__class__.prepared_statement_staff} (%s);"
-            cursor.execute(exec_staff, (self.staff_number,))
-            staff_data = cursor.fetchone()
-            if not staff_data:
-                print(f"Error: Staff with number {self.staff_number} not found.")
-                cursor.close()
-                return
-            staff_id = staff_data[0]
-            
-            # Check for an existing time off request for this staff.
-            exec_request = f"EXECUTE {self.__class__.prepared_statement_request} (%s, %s, %s, %s, %s, %s, %s);"
-            cursor.execute(exec_request, (staff_id, self.start_date, self.end_date,
-                                            self.start_date, self.end_date,
-                                            self.start_date, self.end_date))
-            request = cursor.fetchone()
-            
-            # If a request exists and a substitute is already assigned, retrieve assigned substitute details.
-            if request and request[3] is not None:
-                exec_assigned = f"EXECUTE {self.__class__.prepared_statement_assigned} (%s, %s, %s);"
-                cursor.execute(exec_assigned, (request[3], self.start_date, self.end_date))
-                assigned_sub = cursor.fetchone()
-                if assigned_sub:
-                    self.substitutes = [{
-                        "number": assigned_sub[0],
-                        "first_name": assigned_sub[1],
-                        "last_name": assigned_sub[2],
-                        "work_email": assigned_sub[3],
-                        "availability_start": assigned_sub[4],
-                        "availability_end": assigned_sub[5],
-                        "already_assigned": True
-                    }]
-                    cursor.close()
-                    return
-            
-            # Retrieve available substitutes using the prepared statement.
-            exec_available = f"EXECUTE {self.__class__.prepared_statement_available} (%s, %s, %s, %s, %s, %s, %s, %s);"
-            cursor.execute(exec_available, (self.start_date, self.end_date,
-                                            self.start_date, self.end_date,
-                                            self.start_date, self.end_date,
-                                            self.start_date, self.end_date))
-            available_subs = cursor.fetchall()
-            
-            self.substitutes = []
-            for sub in available_subs:
-                self.substitutes.append({
-                    "number": sub[0],
-                    "first_name": sub[1],
-                    "last_name": sub[2],
-                    "work_email": sub[3],
-                    "availability_start": sub[4],
-                    "availability_end": sub[5],
-                    "already_assigned": False
-                })
-            
-            cursor.close()
+            with pooled_connection(self.pool) as connection:
+                cursor = cached_cursor(connection, NamedTupleCursor)
+                
+                statement_cache.execute(cursor, self.__class__.prepared_statement_suggest,
+                                        (self.staff_number, self.start_date, self.end_date))
+                rows = cursor.fetchall()
         except Exception as e:
             print(f"Error finding available substitutes: {e}")
-            if 'cursor' in locals() and cursor:
-                cursor.close()
+            return
+        
+        # No rows at all means the staff number does not exist.
+        if not rows:
+            print(f"Error: Staff with number {self.staff_number} not found.")
+            return
+        
+        # A known staff member without suggestions comes back as one row of NULLs.
+        self.substitutes = [sub for sub in rows if sub.number is not None]
+        suggestion_cache.put(cache_key, self.substitutes)
     
     def displayOutput(self):
-        """Displays the list of suggested substitutes."""
+        """Displays the list of suggested substitutes, written with a single print."""
+        # retrieveOutput() has already reported the rejected input.
+        if self.input_error:
+            return
+        
         if not self.substitutes:
             print(f"No available substitutes found for staff {self.staff_number} from {self.start_date} to {self.end_date}.")
             return
         
-        print(f"\n=== Available Substitutes for Staff {self.staff_number} from {self.start_date} to {self.end_date} ===")
+        lines = [f"\n=== Available Substitutes for Staff {self.staff_number} from {self.start_date} to {self.end_date} ==="]
         for i, sub in enumerate(self.substitutes, 1):
-            print(f"\n[{i}] {sub['first_name']} {sub['last_name']}")
-            print(f"    Number: {sub['number']}")
-            print(f"    Email: {sub['work_email']}")
-            print(f"    Available from {sub['availability_start']} to {sub['availability_end']}")
-            if sub.get("already_assigned", False):
-                print("    (Already assigned to this time off request)")
+            lines.append(f"\n[{i}] {sub.first_name} {sub.last_name}")
+            lines.append(f"    Number: {sub.number}")
+            lines.append(f"    Email: {sub.work_email}")
+            lines.append(f"    Available from {sub.availability_start} to {sub.availability_end}")
+            if sub.already_assigned:
+                lines.append("    (Already assigned to this time off request)")
                 
-        print("\n========================================================")
+        lines.append("\n========================================================")
+        print("\n".join(lines))
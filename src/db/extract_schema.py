@@ -1,4 +1,5 @@
 # extract_schema.py
+import mmap
 import os
 
 
@@ -8,16 +9,14 @@ def extract_schema(input_file='NorthEastElementary.txt', output_file='schema.sql
 our database against. Schema is needed to setup the database using the db_setup scripts.
 '''
     try:
-        with open(input_file, 'r') as f:
-            content = f.read()
-        
-        # Find the schema part (between first BEGIN; and COMMIT; before the data loading part)
-        schema_start = content.find('BEGIN;')
-        schema_end = content.find('COMMIT;', schema_start) + len('COMMIT;')
-        schema_sql = content[schema_start:schema_end]
-        
-        with open(output_file, 'w') as f:
-            f.write(schema_sql)
+        # Map the file instead of reading it all in; only the pages searched are loaded.
+        with open(input_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            # Find the schema part (between first BEGIN; and COMMIT; before the data loading part)
+            schema_start = content.find(b'BEGIN;')
+            schema_end = content.find(b'COMMIT;', schema_start) + len(b'COMMIT;')
+            
+            with open(output_file, 'wb') as out:
+                out.write(content[schema_start:schema_end])
         
         print(f"Schema SQL extracted and saved to {output_file}")
         return True
@@ -0,0 +1,46 @@
+-- Objects added on top of schema.sql. schema.sql is regenerated by extract_schema.py, so
+-- these live here instead, and every statement is idempotent: the setup scripts run this
+-- file after schema.sql, and `setup_db_Mac.py --migrate` applies it to an existing database.
+BEGIN;
+
+-- Case-insensitive name lookups and punctuation-insensitive phone lookups in the finders
+CREATE INDEX IF NOT EXISTS StudentLowerNameIdx ON Student (lower(LastName), lower(FirstName));
+CREATE INDEX IF NOT EXISTS GuardianLowerNameIdx ON Guardian (lower(LastName), lower(FirstName));
+CREATE INDEX IF NOT EXISTS GuardianPhoneDigitsIdx ON Guardian (regexp_replace(PhoneNumber, '[^0-9]', '', 'g'));
+CREATE INDEX IF NOT EXISTS StaffLowerNameIdx ON Staff (lower(LastName), lower(FirstName));
+CREATE INDEX IF NOT EXISTS StaffPhoneDigitsIdx ON Staff (regexp_replace(PhoneNumber, '[^0-9]', '', 'g'));
+CREATE INDEX IF NOT EXISTS SubstituteNameIdx ON Substitute (LastName, FirstName) INCLUDE (Number, WorkEmail);
+
+-- Substitute availability and time off date range searches
+CREATE INDEX IF NOT EXISTS AvailabilitySubstituteIdx ON Availability (SubstituteID);
+CREATE INDEX IF NOT EXISTS AvailabilityRangeIdx ON Availability USING gist (daterange(StartDate, EndDate, '[]'));
+CREATE INDEX IF NOT EXISTS TimeOffRequestStaffIdx ON TimeOffRequest (StaffID);
+CREATE INDEX IF NOT EXISTS TimeOffRequestSubstituteIdx ON TimeOffRequest (SubstituteID) WHERE SubstituteID IS NOT NULL;
+CREATE INDEX IF NOT EXISTS TimeOffRequestRangeIdx ON TimeOffRequest USING gist (daterange(StartDate, EndDate, '[]'));
+
+ALTER TABLE ClassType ADD COLUMN IF NOT EXISTS
+	GradeLevel		varchar(1) generated always as (LEFT(ID, 1)) stored;
+
+CREATE INDEX IF NOT EXISTS ClassTypeGradeLevelIdx ON ClassType (GradeLevel);
+
+ALTER TABLE Class ADD COLUMN IF NOT EXISTS
+	IsHomeroom		boolean generated always as (ClassTypeID LIKE '%HR%') stored;
+
+CREATE INDEX IF NOT EXISTS ClassHomeroomIdx ON Class (ID) WHERE IsHomeroom;
+
+-- Guardian details per student, flattened for listStudentGuardianInfo so a lookup is a
+-- single index scan instead of a five-table join. Guardian data rarely changes, so the
+-- view is refreshed explicitly (REFRESH MATERIALIZED VIEW CONCURRENTLY StudentGuardianInfo)
+-- by the setup scripts after loading data, and should be after any bulk guardian change.
+CREATE MATERIALIZED VIEW IF NOT EXISTS StudentGuardianInfo AS
+	SELECT s.Number AS StudentNumber, g.Number, g.FirstName, g.LastName, g.PhoneNumber, g.Email,
+	       a.Street, a.City, st.Name AS State, a.Zip
+	FROM Guardian g
+	JOIN GuardianToStudent sg ON g.ID = sg.GuardianID
+	JOIN Student s ON sg.StudentID = s.ID
+	JOIN Address a ON g.AddressID = a.ID
+	JOIN State st ON a.StateID = st.ID;
+
+CREATE UNIQUE INDEX IF NOT EXISTS StudentGuardianInfoIdx ON StudentGuardianInfo (StudentNumber, Number);
+
+COMMIT;
@@ -3,7 +3,7 @@
 import os
 import sys
 import psycopg2
-from psycopg2 import Error
+from psycopg2 import Error, sql
 import argparse
 import configparser
 
@@ -39,6 +39,42 @@ def load_config(config_path='src/db/db_config.ini'):
     config.read(config_path)
     return config
 
+def apply_migrations(cursor):
+    # Run migrations.sql, which adds the objects schema.sql does not have. Every statement
+    # in it is idempotent, so it is safe on a new database and on an existing one.
+    migrations_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations.sql')
+    with open(migrations_file, 'r') as f:
+        cursor.execute(f.read())
+
+def migrate_database(config):
+    # Bring an existing database up to date without dropping it or reloading its data
+    connection = None
+    try:
+        print(f"\nConnecting to {config['DATABASE']['database']} database...")
+        connection = psycopg2.connect(
+            user=config['DATABASE']['user'],
+            password=config['DATABASE']['password'],
+            host=config['DATABASE']['host'],
+            port=config['DATABASE']['port'],
+            database=config['DATABASE']['database']
+        )
+        cursor = connection.cursor()
+        
+        print("\nApplying migrations...")
+        apply_migrations(cursor)
+        # A view that already existed may be stale
+        cursor.execute("REFRESH MATERIALIZED VIEW StudentGuardianInfo")
+        connection.commit()
+        print("✅ Migrations applied")
+        
+    except (Exception, Error) as error:
+        print(f"Error migrating database: {error}")
+    finally:
+        if connection:
+            cursor.close()
+            connection.close()
+            print("Database connection closed")
+
 def setup_database(config, drop_existing=False):
     # Set up database schema and load data
     try:
@@ -50,9 +86,9 @@ def setup_database(config, drop_existing=False):
             'port': config['DATABASE']['port']
         }
         
-        # Connect to the PostgreSQL server
+        # Connect to the default postgres database, which is never the one dropped
         print("\nConnecting to PostgreSQL server...")
-        connection = psycopg2.connect(**conn_params)
+        connection = psycopg2.connect(**conn_params, database='postgres')
         connection.autocommit = True
         cursor = connection.cursor()
         print("✅ Connected to PostgreSQL server") # the idea of using emojis was inspired by (shamelessly stolen from) a YT shorts video
@@ -62,45 +98,17 @@ def setup_database(config, drop_existing=False):
             try:
                 print(f"\nDropping database {config['DATABASE']['database']} if it exists...")
                 
-                # First, close our connection to PostgreSQL
-                cursor.close()
-                connection.close()
-                
-                # Connect to default postgres database to drop the target database
-                conn_params['database'] = 'postgres'
-                connection = psycopg2.connect(**conn_params)
-                connection.autocommit = True
-                cursor = connection.cursor()
-                
-                # Disconnect all users from the database just in case
-                cursor.execute(f"""
-                    SELECT pg_terminate_backend(pg_stat_activity.pid)
-                    FROM pg_stat_activity
-                    WHERE pg_stat_activity.datname = '{config['DATABASE']['database']}'
-                    AND pid <> pg_backend_pid();
-                """)
-                
-                # Drop the database
-                cursor.execute(f"DROP DATABASE IF EXISTS {config['DATABASE']['database']}")
+                # WITH (FORCE) also disconnects any other sessions on the database (PostgreSQL 13+)
+                cursor.execute(sql.SQL("DROP DATABASE IF EXISTS {} WITH (FORCE)").format(sql.Identifier(config['DATABASE']['database'])))
                 print(f"✅ Database {config['DATABASE']['database']} dropped")
                 
-                # Close connection to postgres
-                cursor.close()
-                connection.close()
-                
-                # Reconnect to the server and remove database parameter
-                conn_params.pop('database', None) 
-                connection = psycopg2.connect(**conn_params)
-                connection.autocommit = True
-                cursor = connection.cursor()
-                
             except Exception as e:
                 print(f"Warning: Could not drop database: {e}")
         
         # Create and connect to the database
         try:
             print(f"\nCreating database {config['DATABASE']['database']}...")
-            cursor.execute(f"CREATE DATABASE {config['DATABASE']['database']}")
+            cursor.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(config['DATABASE']['database'])))
             print(f"✅ Database {config['DATABASE']['database']} created")
         except psycopg2.errors.DuplicateDatabase:
             print(f"ℹ️  Database {config['DATABASE']['database']} already exists")
@@ -128,6 +136,7 @@ def setup_database(config, drop_existing=False):
             schema_sql = f.read()
             
         cursor.execute(schema_sql)
+        apply_migrations(cursor)
         connection.commit()
         print("✅ Database schema created")
         
@@ -165,6 +174,10 @@ def setup_database(config, drop_existing=False):
                 print(f"❌ Error loading data for table {table}: {e}")
                 connection.rollback()
         
+        # Fill the guardian info view from the loaded tables
+        cursor.execute("REFRESH MATERIALIZED VIEW StudentGuardianInfo")
+        connection.commit()
+        
         print("Database setup completed successfully")
         
     except (Exception, Error) as error:
@@ -179,11 +192,16 @@ def main():
     parser = argparse.ArgumentParser(description='Set up the NEE database across platforms')
     parser.add_argument('--config', default='src/db/db_config.ini', help='Path to configuration file')
     parser.add_argument('--clean', action='store_true', help='Drop existing database and recreate it')
+    parser.add_argument('--migrate', action='store_true', help='Apply migrations.sql to an existing database and exit')
     
     args = parser.parse_args()
     
     config = load_config(args.config)
     
+    if args.migrate:
+        migrate_database(config)
+        return
+    
     # Define tables in the order they should be processed
     tables = [
         'ClassType', 'Room', 'State', 'Address', 'Student', 
@@ -1,29 +1,36 @@
 # setup_db_Mac.py
 
+def _read_csv_header(csv_file):
+    """Read the header line of one CSV file, returning (headers, error)"""
+    try:
+        with open(csv_file, 'rb') as f:
+            return f.readline().rstrip(b'\r\n').decode('utf-8').split(','), None
+    except Exception as e:
+        return None, e
+
 def verify_csv_headers(data_dir, tables):
     """Verify that CSV headers match expected table columns"""
-    import csv
     import os
+    from concurrent.futures import ThreadPoolExecutor
     
     print("\nVerifying CSV headers...")
     
+    # Only the first line of each file is read, and the files are opened in parallel;
+    # the results are reported in table order.
+    csv_files = [os.path.join(data_dir, f"{table}.csv") for table in tables]
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = list(executor.map(_read_csv_header, csv_files))
+    
     warnings = 0
-    for table in tables:
-        csv_file = os.path.join(data_dir, f"{table}.csv")
-        
-        if not os.path.exists(csv_file):
+    for table, csv_file, (headers, error) in zip(tables, csv_files, results):
+        if isinstance(error, FileNotFoundError):
             print(f"⚠️  Warning: CSV file {csv_file} not found")
             warnings += 1
-            continue
-            
-        try:
-            with open(csv_file, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                headers = next(reader)
-                print(f"✓ {table}.csv: {headers}")
-        except Exception as e:
-            print(f"⚠️  Error reading {table}.csv: {e}")
+        elif error is not None:
+            print(f"⚠️  Error reading {table}.csv: {error}")
             warnings += 1
+        else:
+            print(f"✓ {table}.csv: {headers}")
             
     if warnings > 0:
         print(f"\n⚠️  Found {warnings} warnings while verifying CSV files")
@@ -35,7 +42,7 @@ def verify_csv_headers(data_dir, tables):
 import os
 import sys
 import psycopg2
-from psycopg2 import Error
+from psycopg2 import Error, sql
 import argparse
 import configparser
 
@@ -59,6 +66,42 @@ def load_config(config_path='src/db/db_config.ini'):
     config.read(config_path)
     return config
 
+def apply_migrations(cursor):
+    """Run migrations.sql, which adds the objects schema.sql does not have. Every statement
+    in it is idempotent, so it is safe on a new database and on an existing one."""
+    migrations_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations.sql')
+    with open(migrations_file, 'r') as f:
+        cursor.execute(f.read())
+
+def migrate_database(config):
+    """Bring an existing database up to date without dropping it or reloading its data"""
+    connection = None
+    try:
+        print(f"\nConnecting to {config['DATABASE']['database']} database...")
+        connection = psycopg2.connect(
+            user=config['DATABASE']['user'],
+            password=config['DATABASE']['password'],
+            host=config['DATABASE']['host'],
+            port=config['DATABASE']['port'],
+            database=config['DATABASE']['database']
+        )
+        cursor = connection.cursor()
+        
+        print("\nApplying migrations...")
+        apply_migrations(cursor)
+        # A view that already existed may be stale
+        cursor.execute("REFRESH MATERIALIZED VIEW StudentGuardianInfo")
+        connection.commit()
+        print("✅ Migrations applied")
+        
+    except (Exception, Error) as error:
+        print(f"Error migrating database: {error}")
+    finally:
+        if connection:
+            cursor.close()
+            connection.close()
+            print("Database connection closed")
+
 def setup_database(config, drop_existing=False):
     """Set up database schema and load data"""
     try:
@@ -70,9 +113,9 @@ def setup_database(config, drop_existing=False):
             'port': config['DATABASE']['port']
         }
         
-        # Connect to the PostgreSQL server
+        # Connect to the default postgres database, which is never the one dropped
         print("\nConnecting to PostgreSQL server...")
-        connection = psycopg2.connect(**conn_params)
+        connection = psycopg2.connect(**conn_params, database='postgres')
         connection.autocommit = True
         cursor = connection.cursor()
         print("✅ Connected to PostgreSQL server")
@@ -82,53 +125,17 @@ def setup_database(config, drop_existing=False):
             try:
                 print(f"\nDropping database {config['DATABASE']['database']} if it exists...")
                 
-                # First, close our connection to PostgreSQL
-                cursor.close()
-                connection.close()
-                
-                # Connect to a different database (postgres) to drop the target database
-                conn_params['database'] = 'postgres'  # Connect to default postgres database
-                connection = psycopg2.connect(**conn_params)
-                connection.autocommit = True
-                cursor = connection.cursor()
-                
-                # Disconnect all users from the database
-                cursor.execute(f"""
-                    SELECT pg_terminate_backend(pg_stat_activity.pid)
-                    FROM pg_stat_activity
-                    WHERE pg_stat_activity.datname = '{config['DATABASE']['database']}'
-                    AND pid <> pg_backend_pid();
-                """)
-                
-                # Drop the database
-                cursor.execute(f"DROP DATABASE IF EXISTS {config['DATABASE']['database']}")
+                # WITH (FORCE) also disconnects any other sessions on the database (PostgreSQL 13+)
+                cursor.execute(sql.SQL("DROP DATABASE IF EXISTS {} WITH (FORCE)").format(sql.Identifier(config['DATABASE']['database'])))
                 print(f"✅ Database {config['DATABASE']['database']} dropped")
                 
-                # Close connection to postgres
-                cursor.close()
-                connection.close()
-                
-                # Reconnect to the server
-                conn_params.pop('database', None)  # Remove database parameter
-                connection = psycopg2.connect(**conn_params)
-                connection.autocommit = True
-                cursor = connection.cursor()
-                
             except Exception as e:
                 print(f"⚠️  Warning: Could not drop database: {e}")
-                # Try to reconnect if an error occurred
-                try:
-                    conn_params.pop('database', None)  # Remove database parameter
-                    connection = psycopg2.connect(**conn_params)
-                    connection.autocommit = True
-                    cursor = connection.cursor()
-                except Exception:
-                    pass
         
         # Create and connect to the database
         try:
             print(f"\nCreating database {config['DATABASE']['database']}...")
-            cursor.execute(f"CREATE DATABASE {config['DATABASE']['database']}")
+            cursor.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(config['DATABASE']['database'])))
             print(f"✅ Database {config['DATABASE']['database']} created")
         except psycopg2.errors.DuplicateDatabase:
             print(f"ℹ️  Database {config['DATABASE']['database']} already exists")
@@ -156,6 +163,7 @@ def setup_database(config, drop_existing=False):
             schema_sql = f.read()
             
         cursor.execute(schema_sql)
+        apply_migrations(cursor)
         connection.commit()
         print("✅ Database schema created")
         
@@ -189,6 +197,9 @@ def setup_database(config, drop_existing=False):
             'StaffToClass', 'StudentToClass', 'GuardianToStudent'
         ]
         
+        # All tables are loaded in one transaction, each inside its own savepoint. The CSV
+        # files are sent as raw bytes, and the server decodes them as UTF-8.
+        
         # Import regular tables first
         print("\nImporting regular tables...")
         for table in regular_tables:
@@ -205,13 +216,17 @@ def setup_database(config, drop_existing=False):
                 csv_path = csv_file
             
             try:
-                with open(csv_file, 'r', encoding='utf-8') as f:
+                cursor.execute("SAVEPOINT load_table")
+                with open(csv_file, 'rb') as f:
                     cursor.copy_expert(f"COPY {table} FROM STDIN WITH CSV HEADER", f)
-                connection.commit()
+                # Check the deferred foreign keys now, so a bad row fails only this table.
+                cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+                cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+                cursor.execute("RELEASE SAVEPOINT load_table")
                 print(f"✅ Data loaded for table: {table}")
             except Exception as e:
                 print(f"❌ Error loading data for table {table}: {e}")
-                connection.rollback()
+                cursor.execute("ROLLBACK TO SAVEPOINT load_table")
         
         # Import tables with serial ID columns
         print("\nImporting tables with serial ID columns...")
@@ -231,14 +246,23 @@ def setup_database(config, drop_existing=False):
             columns_str = ', '.join(columns)
             
             try:
-                with open(csv_file, 'r', encoding='utf-8') as f:
+                cursor.execute("SAVEPOINT load_table")
+                with open(csv_file, 'rb') as f:
                     cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH CSV HEADER", f)
-                connection.commit()
+                # Check the deferred foreign keys now, so a bad row fails only this table.
+                cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+                cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+                cursor.execute("RELEASE SAVEPOINT load_table")
                 print(f"✅ Data loaded for table: {table}")
             except Exception as e:
                 print(f"❌ Error loading data for table {table}: {e}")
-                connection.rollback()
+                cursor.execute("ROLLBACK TO SAVEPOINT load_table")
+        
+        # Fill the guardian info view from the loaded tables.
+        cursor.execute("REFRESH MATERIALIZED VIEW StudentGuardianInfo")
         
+        # Commit every table at once; the savepoints above drop only a table that failed.
+        connection.commit()
         print("Database setup completed successfully")
         
     except (Exception, Error) as error:
@@ -253,12 +277,17 @@ def main():
     parser = argparse.ArgumentParser(description='Set up the NEE database across platforms')
     parser.add_argument('--config', default='src/db/db_config.ini', help='Path to configuration file')
     parser.add_argument('--clean', action='store_true', help='Drop existing database and recreate it')
+    parser.add_argument('--migrate', action='store_true', help='Apply migrations.sql to an existing database and exit')
     parser.add_argument('--verify', action='store_true', help='Verify CSV files only without importing')
     
     args = parser.parse_args()
     
     config = load_config(args.config)
     
+    if args.migrate:
+        migrate_database(config)
+        return
+    
     # Define tables in the order they should be processed
     tables = [
         'ClassType', 'Room', 'State', 'Address', 'Student', 
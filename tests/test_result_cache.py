@@ -0,0 +1,63 @@
+# test_result_cache.py
+import unittest
+from unittest import mock
+
+from src.api import _finder_base
+from src.api._result_cache import ResultCache, result_cache
+from src.api.findGuardianNumber import findGuardianNumber
+
+
+class ResultCacheTest(unittest.TestCase):
+    def test_entry_expires_after_ttl(self):
+        cache = ResultCache(ttl=60)
+        with mock.patch("src.api._result_cache.time.monotonic", return_value=1000.0):
+            cache.put(("api", "key"), "value")
+            self.assertEqual(cache.get(("api", "key")), "value")
+        with mock.patch("src.api._result_cache.time.monotonic", return_value=1060.0):
+            self.assertIsNone(cache.get(("api", "key")))
+            self.assertNotIn(("api", "key"), cache.entries)
+
+    def test_finder_cache_has_ttl(self):
+        self.assertIsNotNone(result_cache.ttl)
+
+
+class FinderCacheTest(unittest.TestCase):
+    def setUp(self):
+        result_cache.invalidate()
+        self.addCleanup(result_cache.invalidate)
+
+        # Stand-ins for the pool and cursor, so retrieveOutput() runs without a database.
+        self.cursor = mock.Mock()
+        self.cursor.fetchone.side_effect = [{"number": "1"}, {"number": "2"}]
+        patches = [
+            mock.patch.object(findGuardianNumber, "prepared_statement_name",
+                              ("SELECT 1", ("text", "text")), create=True),
+            mock.patch.object(_finder_base, "pooled_connection"),
+            mock.patch.object(_finder_base, "cached_cursor", return_value=self.cursor),
+            mock.patch.object(_finder_base, "statement_cache"),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def lookup(self):
+        api = findGuardianNumber(pool=None)
+        api.getInput(first_name="Sue", last_name="Stu")
+        api.retrieveOutput()
+        return api.guardian_details
+
+    def test_expired_entry_is_fetched_again(self):
+        with mock.patch("src.api._result_cache.time.monotonic", return_value=1000.0):
+            self.assertEqual(self.lookup(), {"number": "1"})
+            # A repeat lookup is answered from the cache.
+            self.assertEqual(self.lookup(), {"number": "1"})
+        self.assertEqual(self.cursor.fetchone.call_count, 1)
+
+        with mock.patch("src.api._result_cache.time.monotonic",
+                        return_value=1000.0 + result_cache.ttl):
+            self.assertEqual(self.lookup(), {"number": "2"})
+        self.assertEqual(self.cursor.fetchone.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()